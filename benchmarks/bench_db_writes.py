@@ -0,0 +1,73 @@
+"""
+Compares the per-row DatabaseHandler write path with the batch APIs.
+
+Usage:
+    python -m benchmarks.bench_db_writes [number_of_tweets]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from utils.db_handler import DatabaseHandler
+
+
+def make_tweets(count, offset=0):
+    return [
+        {
+            "model_name": "gpt-4o-mini",
+            "personality": "The Knowledgeable Guide",
+            "content_type": "Informative Snippets and Facts",
+            "content_format": "Text",
+            "tweet_text": f"Benchmark tweet {offset + i}: a fact about topic {(offset + i) * 7919 % 104729} #bench",
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label, count, func):
+    # The handler prints one line per row on the per-row path; keep that out of the timing output
+    with contextlib.redirect_stdout(io.StringIO()):
+        started_at = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started_at
+    print(f"{label:<32} {elapsed:8.3f}s  {count / elapsed:10,.0f} rows/s")
+    return elapsed
+
+
+def main(count):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_handler = DatabaseHandler(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        per_row_tweets = make_tweets(count)
+        batch_tweets = make_tweets(count, offset=count)
+        per_row_ids = []
+
+        print(f"Writing {count:,} tweets")
+        per_row = timed(
+            "add_tweet (per row)",
+            count,
+            lambda: per_row_ids.extend(db_handler.add_tweet(**tweet) for tweet in per_row_tweets),
+        )
+        batch_ids = []
+        batch = timed("add_tweets (batch)", count, lambda: batch_ids.extend(db_handler.add_tweets(batch_tweets)))
+        print(f"{'speedup':<32} {per_row / batch:8.1f}x")
+
+        print(f"Updating {count:,} posted URLs")
+        per_row = timed(
+            "update_tweet_url (per row)",
+            count,
+            lambda: [db_handler.update_tweet_url(tweet_id, f"https://x.com/a/{tweet_id}") for tweet_id in per_row_ids],
+        )
+        batch = timed(
+            "update_urls (batch)",
+            count,
+            lambda: db_handler.update_urls({tweet_id: f"https://x.com/b/{tweet_id}" for tweet_id in batch_ids}),
+        )
+        print(f"{'speedup':<32} {per_row / batch:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,71 @@
+"""
+Compares the Finshots article extraction backends on saved article HTML.
+
+The fixtures are the raw gh-content sections in data/news_articles_new.json, wrapped in a page with the head,
+navigation and footer a real article page has around them.
+
+Usage:
+    python -m benchmarks.bench_extraction [repetitions]
+"""
+
+import sys
+import time
+
+from utils.finshots import EXTRACTION_BACKENDS, parse_article
+from utils.load_json import load_news_articles
+
+FIXTURES_PATH = "data/news_articles_new.json"
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<link rel="stylesheet" href="/assets/built/screen.css">
+<script>window.dataLayer = window.dataLayer || [];</script>
+</head>
+<body class="post-template">
+<header class="site-header"><nav>{nav}</nav></header>
+<main class="site-main">
+<article class="article post">
+<header class="article-header"><h1 class="article-title">{title}</h1></header>
+{content}
+</article>
+<aside class="read-more">{related}</aside>
+</main>
+<footer class="site-footer"><p>Finshots</p></footer>
+</body>
+</html>"""
+
+
+def make_pages():
+    nav = "".join(f'<a href="/tag-{i}/">Tag {i}</a>' for i in range(20))
+    related = "".join(
+        f'<a class="post-card-image-link" href="/related-{i}/"><img src="/img/{i}.jpg" alt="Related {i}"></a>'
+        for i in range(12)
+    )
+    articles = [article for persona in load_news_articles(FIXTURES_PATH)["personas"] for article in persona["articles"]]
+    # Encoded like response.content, which is what the crawler passes in
+    return [
+        PAGE_TEMPLATE.format(title=article["title"], content=article["content"], nav=nav, related=related).encode()
+        for article in articles
+    ]
+
+
+def main(repetitions):
+    pages = make_pages()
+    reference = [parse_article(page, backend="bs4") for page in pages]
+    print(f"Extracting {len(pages)} pages x {repetitions} ({sum(map(len, pages)) / len(pages) / 1024:.0f} KB avg)")
+
+    baseline = None
+    for backend in EXTRACTION_BACKENDS:
+        started_at = time.perf_counter()
+        for _ in range(repetitions):
+            results = [parse_article(page, backend=backend) for page in pages]
+        per_page = (time.perf_counter() - started_at) / (repetitions * len(pages))
+        baseline = baseline or per_page
+        same = "same output" if results == reference else "DIFFERENT OUTPUT"
+        print(f"{backend:<16} {per_page * 1000:8.2f} ms/page  {baseline / per_page:6.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -20,6 +20,7 @@ col3, col4 = st.columns(2)
 col5, col6 = st.columns(2)
 col7, col8 = st.columns(2)
 col9, col10 = st.columns(2)
+col11, col12 = st.columns(2)
 
 with col1:
     st.subheader("🏠 Mortgage Calculator")
@@ -105,6 +106,14 @@ with col10:
     else:
         st.markdown("[Create Index](10_Index_Creator)")
 
+with col11:
+    st.subheader("🔎 Article Search")
+    st.markdown("Search the scraped articles by topic.")
+    if hasattr(st, "page_link"):
+        st.page_link("pages/11_Article_Search.py", label="Search Articles", icon="🔎")
+    else:
+        st.markdown("[Search Articles](11_Article_Search)")
+
 st.divider()
 
 with st.expander("About this Project"):
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, UniqueConstraint
+
+from models.tweet import Base
+
+
+class Article(Base):
+    """
+    Model for news articles used as style examples by the Article Generator.
+    """
+
+    __tablename__ = "articles"
+    # The unique indexes make the duplicate check on insert a single index lookup
+    __table_args__ = (
+        UniqueConstraint("persona", "title", name="uq_articles_persona_title"),
+        Index("ix_articles_updated_at", "updated_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    persona = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    url = Column(String, nullable=True, unique=True)
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)  # Set whenever the row changes
+
+    def __repr__(self):
+        return f"<Article(persona='{self.persona}', title='{self.title[:50]}')>"
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, String
+
+from models.tweet import Base
+
+
+class CrawledUrl(Base):
+    """
+    Model for the scraper's URL frontier: what was fetched from each URL and whether its article was stored.
+    """
+
+    __tablename__ = "crawled_urls"
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String, nullable=False, unique=True)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)  # The Last-Modified header, sent back as If-Modified-Since
+    content_hash = Column(String, nullable=True)  # SHA-256 of the extracted article
+    http_status = Column(Integer, nullable=True)
+    ingested = Column(Boolean, nullable=False, default=False)  # True once the article has been stored
+    fetched_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<CrawledUrl(url='{self.url}', ingested={self.ingested})>"
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+
+from models.tweet import Base
+
+
+class GenerationJob(Base):
+    """
+    Model for one tweet draft requested by a batch generation run, used to checkpoint and resume the run.
+    """
+
+    __tablename__ = "generation_jobs"
+    __table_args__ = (
+        # One job per slot of each personality x content type x format combination in a run
+        UniqueConstraint(
+            "run_id", "personality", "content_type", "content_format", "slot", name="uq_generation_jobs_slot"
+        ),
+        Index("ix_generation_jobs_run_id_status", "run_id", "status"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(String, nullable=False)
+    model_name = Column(String, nullable=False)
+    personality = Column(String, nullable=False)
+    content_type = Column(String, nullable=False)
+    content_format = Column(String, nullable=False)
+    slot = Column(Integer, nullable=False, default=0)
+    status = Column(String, nullable=False, default="pending")  # pending, in_progress, done or failed
+    attempts = Column(Integer, nullable=False, default=0)
+    tweet_id = Column(Integer, ForeignKey("tweets.id"), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<GenerationJob(run_id='{self.run_id}', personality='{self.personality}', status='{self.status}')>"
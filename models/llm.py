@@ -1,5 +1,8 @@
 from utils.api_config import GEMINI_API, OPENAI_API
 
+# Tokens of chat history sent per turn unless a model overrides it
+DEFAULT_CONTEXT_BUDGET = 8000
+
 
 class Model:
     """Represents an AI model with its configuration."""
@@ -7,11 +10,13 @@ class Model:
     name: str  # User-friendly display name (e.g., "GPT-4o")
     model_name: str  # API identifier (e.g., "gpt-4o")
     api: dict  # Associated API configuration (GEMINI_API or OPENAI_API)
+    context_budget: int  # Maximum tokens of chat history sent with each request
 
-    def __init__(self, name, model_name, api):
+    def __init__(self, name, model_name, api, context_budget=DEFAULT_CONTEXT_BUDGET):
         self.name = name
         self.model_name = model_name
         self.api = api
+        self.context_budget = context_budget
 
     def __repr__(self):
         return f"Model(name={self.name}, model_name={self.model_name})"
@@ -25,6 +30,7 @@ GEMINI_2_0_FLASH = Model(
     name="Gemini 2.0 Flash",
     model_name="gemini-2.0-flash",
     api=GEMINI_API,
+    context_budget=16000,
 )
 GEMINI_2_0_FLASH_LITE = Model(
     name="Gemini 2.0 Flash Lite",
@@ -46,6 +52,7 @@ GPT_4_1 = Model(
     name="GPT-4.1",
     model_name="gpt-4.1",
     api=OPENAI_API,
+    context_budget=16000,
 )
 
 GPT_4_1_MINI = Model(
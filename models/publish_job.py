@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+
+from models.tweet import Base
+
+
+class PublishJob(Base):
+    """
+    Model for tweets waiting to be published by the background publishing queue.
+    """
+
+    __tablename__ = "publish_jobs"
+    # The worker picks the next due job by status and time
+    __table_args__ = (Index("ix_publish_jobs_status_next_attempt_at", "status", "next_attempt_at"),)
+
+    id = Column(Integer, primary_key=True)
+    tweet_id = Column(Integer, ForeignKey("tweets.id"), nullable=False)
+    platform = Column(String, nullable=False, default="X")
+    status = Column(String, nullable=False, default="pending")  # pending, in_progress, posted or failed
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<PublishJob(tweet_id={self.tweet_id}, platform='{self.platform}', status='{self.status}')>"
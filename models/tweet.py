@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -12,6 +12,14 @@ class Tweet(Base):
     """
 
     __tablename__ = "tweets"
+    # Newest-first keyset pagination, optionally narrowed by one of the filter columns
+    __table_args__ = (
+        Index("ix_tweets_created_at_id", "created_at", "id"),
+        Index("ix_tweets_model_name_created_at", "model_name", "created_at", "id"),
+        Index("ix_tweets_personality_created_at", "personality", "created_at", "id"),
+        Index("ix_tweets_content_type_created_at", "content_type", "created_at", "id"),
+        Index("ix_tweets_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     model_name = Column(String)
@@ -21,6 +29,7 @@ class Tweet(Base):
     tweet_text = Column(Text)
     posted_url = Column(String, nullable=True)  # URL if posted successfully
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)  # Set whenever the row changes
 
     def __repr__(self):
         return f"<Tweet(tweet_text='{self.tweet_text[:50]}...', posted_url='{self.posted_url}')>"
@@ -0,0 +1,33 @@
+import time
+
+import streamlit as st
+
+from utils.article_store import get_article_store
+
+st.set_page_config(page_title="Article Search", page_icon="🔎")
+
+st.title("🔎 Article Search")
+st.caption("Find past coverage of a topic in the scraped articles.")
+
+article_store = get_article_store()
+
+col1, col2 = st.columns([3, 1])
+query = col1.text_input("Search articles:", placeholder="e.g. gold prices")
+persona = col2.selectbox("Persona:", [None] + article_store.persona_names(), format_func=lambda name: name or "All")
+
+if query:
+    started_at = time.perf_counter()
+    results = article_store.search(query, persona=persona)
+    elapsed = time.perf_counter() - started_at
+    st.caption(f"{len(results)} articles found in {elapsed * 1000:.1f} ms")
+
+    for result in results:
+        st.write(f"#### {result['title']}")
+        st.markdown(result["snippet"])
+        with st.expander("Read article"):
+            article = article_store.get(result["id"])
+            if article.url:
+                st.markdown(f"[Source]({article.url})")
+            st.text(article.content)
+elif query is not None:
+    st.write(f"{article_store.count()} articles indexed.")
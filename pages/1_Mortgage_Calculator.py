@@ -1,52 +1,170 @@
-import math
-
+import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from utils.amortization import (
+    amortization_schedule,
+    amortization_schedule_with_events,
+    calculate_monthly_payment,
+    scenario_grid,
+    yearly_balances,
+)
+
+EVENT_TYPES = ["Lump-sum Prepayment", "Extra Monthly Payment", "Rate Reset"]
+
 st.set_page_config(page_title="Mortgage Calculator", page_icon="🏠")
 
+st.title("🏠 Mortgage Repayments Calculator")
+st.write("Enter your loan details to calculate monthly payments and see the amortization schedule.")
+
+st.divider()
 
-def calculate_monthly_payment(principal, annual_interest_rate, years):
+
+def render_scenario_grid():
+    """
+    Renders the scenario grid mode: a deposit x rate x term sweep shown as a heatmap and a sortable table.
     """
-    Calculates the fixed monthly mortgage payment.
+    st.write("### Scenario Ranges")
+    # A form batches all range inputs into a single rerun instead of one rerun per widget change
+    with st.form("scenario_grid_form"):
+        home_value = st.number_input(
+            "Home Value (₹)", min_value=0, value=10000000, step=50000, help="Total value of the property."
+        )
+        grid_col1, grid_col2, grid_col3 = st.columns(3)
+        with grid_col1:
+            min_deposit, max_deposit = st.slider(
+                "Deposit range (₹)",
+                min_value=0,
+                max_value=max(int(home_value), 10000),
+                value=(0, int(home_value) // 2),
+                step=10000,
+            )
+            deposit_step = st.number_input("Deposit step (₹)", min_value=10000, value=250000, step=10000)
+        with grid_col2:
+            min_rate, max_rate = st.slider(
+                "Interest rate range (%)", min_value=0.0, max_value=20.0, value=(5.0, 12.0), step=0.05
+            )
+            rate_step = st.number_input("Rate step (%)", min_value=0.01, value=0.25, step=0.05, format="%.2f")
+        with grid_col3:
+            min_term, max_term = st.slider("Loan term range (years)", min_value=1, max_value=50, value=(10, 30))
+            term_step = st.number_input("Term step (years)", min_value=1, value=1, step=1)
+        st.form_submit_button("Run Scenarios")
+
+    deposits = np.arange(min_deposit, max_deposit + deposit_step / 2, deposit_step)
+    rates = np.round(np.arange(min_rate, max_rate + rate_step / 2, rate_step), 4)
+    terms = np.arange(min_term, max_term + 1, term_step)
+    grid_df = scenario_grid(home_value, deposits, rates, terms)
+
+    if grid_df.empty:
+        st.info("No valid scenarios for the selected ranges.")
+        return
+
+    st.caption(f"Evaluated {len(grid_df):,} scenarios.")
+
+    st.write("### Monthly Payment Heatmap")
+    heatmap_deposit = st.select_slider(
+        "Deposit for heatmap (₹)", options=grid_df["Deposit"].unique(), format_func=lambda value: f"₹{value:,.0f}"
+    )
+    heatmap_df = grid_df[grid_df["Deposit"] == heatmap_deposit].pivot(
+        index="Interest Rate", columns="Loan Term", values="Monthly Payment"
+    )
+    # Cells are centred on their term and rate, so a single-value range still spans one step
+    heatmap_terms, heatmap_rates = heatmap_df.columns.to_numpy(), heatmap_df.index.to_numpy()
+    fig, ax = plt.subplots()
+    image = ax.imshow(
+        heatmap_df.to_numpy(),
+        aspect="auto",
+        origin="lower",
+        cmap="viridis",
+        extent=(
+            heatmap_terms[0] - term_step / 2,
+            heatmap_terms[-1] + term_step / 2,
+            heatmap_rates[0] - rate_step / 2,
+            heatmap_rates[-1] + rate_step / 2,
+        ),
+    )
+    ax.set_xlabel("Loan Term (years)")
+    ax.set_ylabel("Annual Interest Rate (%)")
+    fig.colorbar(image, ax=ax, label="Monthly Payment (₹)")
+    st.pyplot(fig)
+    plt.close(fig)
+
+    st.write("### All Scenarios")
+    st.dataframe(
+        grid_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Deposit": st.column_config.NumberColumn(format="₹%.0f"),
+            "Interest Rate": st.column_config.NumberColumn(format="%.2f%%"),
+            "Loan Amount": st.column_config.NumberColumn(format="₹%.0f"),
+            "Monthly Payment": st.column_config.NumberColumn(format="₹%.2f"),
+            "Total Payments": st.column_config.NumberColumn(format="₹%.2f"),
+            "Total Interest": st.column_config.NumberColumn(format="₹%.2f"),
+        },
+    )
 
-    Args:
-        principal (float): The total loan amount.
-        annual_interest_rate (float): The annual interest rate (as a percentage).
-        years (int): The loan term in years.
+
+@st.cache_data(max_entries=64)
+def cached_schedule(loan_amount, interest_rate, loan_term):
+    """
+    Memoizes the plain amortization schedule and its yearly rollup on the loan inputs.
 
     Returns:
-        float: The calculated monthly payment. Returns principal / number_of_payments if interest rate is 0.
-               Returns float('inf') or raises error if inputs are invalid (handled by st.number_input).
+        tuple: (schedule_df, yearly_df)
     """
-    if annual_interest_rate == 0:
-        if years > 0:
-            return principal / (years * 12)
-        else:
-            return float("inf")
+    schedule_df = amortization_schedule(loan_amount, interest_rate, loan_term)
+    return schedule_df, yearly_balances(schedule_df)
 
-    monthly_interest_rate = (annual_interest_rate / 100) / 12
-    number_of_payments = years * 12
 
-    try:
-        monthly_payment = (
-            principal
-            * (monthly_interest_rate * (1 + monthly_interest_rate) ** number_of_payments)
-            / ((1 + monthly_interest_rate) ** number_of_payments - 1)
-        )
-        return monthly_payment
-    except OverflowError:
-        st.error("Calculation resulted in an overflow. Please check your input values.")
-        return float("inf")
-    except ZeroDivisionError:
-        st.error("Calculation resulted in division by zero. This might happen with invalid inputs.")
-        return float("inf")
+@st.cache_data(max_entries=64)
+def cached_schedule_with_events(loan_amount, interest_rate, loan_term, prepayments, extra_payments, rate_changes):
+    """
+    Memoizes the amortization schedule with prepayments and rate resets, and its yearly rollup, on the inputs.
 
+    Returns:
+        tuple: (schedule_df, yearly_df)
+    """
+    base_schedule_df, _ = cached_schedule(loan_amount, interest_rate, loan_term)
+    schedule_df = amortization_schedule_with_events(
+        loan_amount,
+        interest_rate,
+        loan_term,
+        prepayments=prepayments,
+        extra_payments=extra_payments,
+        rate_changes=rate_changes,
+        base_schedule=base_schedule_df,
+    )
+    return schedule_df, yearly_balances(schedule_df)
 
-st.title("🏠 Mortgage Repayments Calculator")
-st.write("Enter your loan details to calculate monthly payments and see the amortization schedule.")
 
-st.divider()
+def collect_events(events_df):
+    """
+    Converts the rows of the events editor into the month-keyed dictionaries used by the amortization engine.
+
+    Args:
+        events_df (pd.DataFrame): Rows with "Event", "Year", "Month" and "Value" columns.
+
+    Returns:
+        tuple: (prepayments, extra_payments, rate_changes) dictionaries keyed by loan month.
+    """
+    events = {event_type: {} for event_type in EVENT_TYPES}
+    for row in events_df.dropna(subset=["Event", "Year", "Value"]).itertuples(index=False):
+        month_of_year = int(row.Month) if pd.notna(row.Month) else 1
+        loan_month = (int(row.Year) - 1) * 12 + month_of_year
+        if row.Event == "Lump-sum Prepayment":
+            # Several prepayments in the same month add up
+            events[row.Event][loan_month] = events[row.Event].get(loan_month, 0.0) + row.Value
+        else:
+            events[row.Event][loan_month] = row.Value
+    return tuple(events[event_type] for event_type in EVENT_TYPES)
+
+
+mode = st.radio("Mode", ["Single Loan", "Scenario Grid"], horizontal=True)
+if mode == "Scenario Grid":
+    render_scenario_grid()
+    st.stop()
 
 st.write("### Input Loan Details")
 col1, col2 = st.columns(2)
@@ -74,6 +192,8 @@ if loan_amount < 0:
     st.stop()
 
 monthly_payment = calculate_monthly_payment(loan_amount, interest_rate, loan_term)
+if monthly_payment == float("inf") and loan_amount > 0:
+    st.error("Calculation resulted in an overflow. Please check your input values.")
 
 if monthly_payment != float("inf") and loan_amount > 0:
     number_of_payments = loan_term * 12
@@ -94,44 +214,59 @@ if monthly_payment != float("inf") and loan_amount > 0:
 
     st.write("### Amortization Schedule")
 
-    schedule = []
-    remaining_balance = loan_amount
-    monthly_interest_rate_calc = (interest_rate / 100) / 12
-
-    for i in range(1, number_of_payments + 1):
-        interest_payment = remaining_balance * monthly_interest_rate_calc
-        principal_payment = monthly_payment - interest_payment
+    base_schedule_df, base_yearly_df = cached_schedule(loan_amount, interest_rate, loan_term)
 
-        # Ensure principal payment doesn't exceed remaining balance (can happen in the last month due to rounding)
-        if principal_payment > remaining_balance:
-            principal_payment = remaining_balance
-            # Adjust final month's payment if necessary due to rounding
-            monthly_payment_adj = interest_payment + principal_payment
-        else:
-            monthly_payment_adj = monthly_payment
-
-        remaining_balance -= principal_payment
-
-        # Ensure remaining balance doesn't go below zero due to floating point inaccuracies
-        if remaining_balance < 0:
-            remaining_balance = 0
-
-        year = math.ceil(i / 12)
-
-        schedule.append(
-            {
-                "Month": i,
-                "Year": year,
-                "Payment": monthly_payment_adj,  # Use adjusted payment for final month if needed
-                "Principal Paid": principal_payment,
-                "Interest Paid": interest_payment,
-                "Remaining Balance": remaining_balance,
-            }
+    with st.expander("Prepayments & Rate Resets"):
+        st.caption(
+            "Prepayments and extra payments keep the EMI and shorten the loan. "
+            "A rate reset recalculates the EMI over the remaining term. "
+            "Use the rate (%) as the value for rate resets."
+        )
+        events_df = st.data_editor(
+            pd.DataFrame(
+                {
+                    "Event": pd.Series(dtype="str"),
+                    "Year": pd.Series(dtype="int"),
+                    "Month": pd.Series(dtype="int"),
+                    "Value": pd.Series(dtype="float"),
+                }
+            ),
+            num_rows="dynamic",
+            use_container_width=True,
+            column_config={
+                "Event": st.column_config.SelectboxColumn(options=EVENT_TYPES, required=True),
+                "Year": st.column_config.NumberColumn(min_value=1, max_value=loan_term, step=1, required=True),
+                "Month": st.column_config.NumberColumn(
+                    min_value=1, max_value=12, step=1, default=1, help="Month within the year."
+                ),
+                "Value": st.column_config.NumberColumn(
+                    min_value=0.0, help="Amount (₹) for payments, annual rate (%) for rate resets.", required=True
+                ),
+            },
+            key="loan_events",
         )
 
-    schedule_df = pd.DataFrame(schedule)
-
-    with st.expander("View Full Payment Schedule Table"):
+    prepayments, extra_payments, rate_changes = collect_events(events_df)
+    has_events = bool(prepayments or extra_payments or rate_changes)
+    if has_events:
+        schedule_df, yearly_df = cached_schedule_with_events(
+            loan_amount, interest_rate, loan_term, prepayments, extra_payments, rate_changes
+        )
+        adjusted_interest = schedule_df["Interest Paid"].sum()
+        months_saved = number_of_payments - len(schedule_df)
+
+        event_col1, event_col2, event_col3 = st.columns(3)
+        with event_col1:
+            st.metric(label="Interest With Changes", value=f"₹{adjusted_interest:,.2f}")
+        with event_col2:
+            st.metric(label="Interest Saved", value=f"₹{total_interest - adjusted_interest:,.2f}")
+        with event_col3:
+            st.metric(label="Loan Shortened By", value=f"{months_saved // 12}y {months_saved % 12}m")
+    else:
+        schedule_df, yearly_df = base_schedule_df, base_yearly_df
+
+    # Building the Styler and shipping every row to the browser is only worth it when the table is shown
+    if st.toggle("View Full Payment Schedule Table"):
         st.dataframe(
             schedule_df.style.format(
                 {
@@ -139,16 +274,27 @@ if monthly_payment != float("inf") and loan_amount > 0:
                     "Principal Paid": "₹{:,.2f}",
                     "Interest Paid": "₹{:,.2f}",
                     "Remaining Balance": "₹{:,.2f}",
+                    "Prepayment": "₹{:,.2f}",
                 }
             )
         )
 
     st.write("### Remaining Loan Balance Over Time")
 
-    # Group by year and take the minimum remaining balance for that year (end-of-year balance)
-    balance_over_time_df = schedule_df[["Year", "Remaining Balance"]].groupby("Year").min().reset_index()
-
-    st.line_chart(balance_over_time_df, x="Year", y="Remaining Balance")
+    if has_events:
+        balance_over_time_df = (
+            base_yearly_df.set_index("Year")
+            .join(yearly_df.set_index("Year"), lsuffix=" (Original)", rsuffix=" (With Changes)")
+            .fillna(0.0)
+            .reset_index()
+        )
+        st.line_chart(
+            balance_over_time_df,
+            x="Year",
+            y=["Remaining Balance (Original)", "Remaining Balance (With Changes)"],
+        )
+    else:
+        st.line_chart(yearly_df, x="Year", y="Remaining Balance")
 
 elif loan_amount <= 0:
     st.info("Loan Amount is zero or negative. Please adjust Home Value and Deposit.")
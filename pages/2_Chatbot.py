@@ -3,6 +3,8 @@ from openai import APIError, BadRequestError, RateLimitError
 
 try:
     from models.llm import TEXT_MODEL_OPTIONS
+    from utils.chat_context import ContextWindow, summarize_turns
+    from utils.streaming import StreamRenderer
     from widgets.sidebar import SidebarManager
 except ImportError as e:
     st.error(f"Failed to import project modules: {e}")
@@ -20,11 +22,21 @@ except Exception as e:
     st.exception(e)
     st.stop()
 
+summarize_older_turns = st.sidebar.toggle(
+    "Summarize older turns",
+    value=True,
+    help="Fold messages that no longer fit in the context budget into a running summary instead of dropping them.",
+)
+
 st.title("💬 Chatbot")
 st.caption(f"🚀 Powered by {selected_model_name}")
 
 if "chatbot_messages" not in st.session_state:
     st.session_state["chatbot_messages"] = [{"role": "assistant", "content": "How can I help you?"}]
+if "chatbot_summary" not in st.session_state:
+    st.session_state["chatbot_summary"] = ""
+    # Messages before this index are already folded into the summary
+    st.session_state["chatbot_summarized_upto"] = 0
 
 for msg in st.session_state.chatbot_messages:
     st.chat_message(msg["role"]).write(msg["content"])
@@ -33,9 +45,24 @@ if prompt := st.chat_input("Ask me anything..."):
     st.session_state.chatbot_messages.append({"role": "user", "content": prompt})
     st.chat_message("user").write(prompt)
 
-    api_messages = st.session_state.chatbot_messages
-
     try:
+        messages = st.session_state.chatbot_messages
+        context_window = ContextWindow(TEXT_MODEL_OPTIONS[selected_model_name].context_budget)
+        summary = st.session_state.chatbot_summary if summarize_older_turns else None
+        api_messages, window_start = context_window.build(messages, summary)
+        # Folding turns into the summary makes it longer, which can push more turns out of the window
+        while summarize_older_turns and window_start > st.session_state.chatbot_summarized_upto:
+            with st.spinner("Summarizing earlier turns..."):
+                summary = summarize_turns(
+                    client,
+                    selected_model_name,
+                    summary,
+                    messages[st.session_state.chatbot_summarized_upto : window_start],
+                )
+            st.session_state.chatbot_summary = summary
+            st.session_state.chatbot_summarized_upto = window_start
+            api_messages, window_start = context_window.build(messages, summary)
+
         response_stream = client.chat.completions.create(
             model=selected_model_name,
             messages=api_messages,
@@ -43,16 +70,9 @@ if prompt := st.chat_input("Ask me anything..."):
         )
 
         with st.chat_message("assistant"):
-            message_placeholder = st.empty()
-            full_response = ""
-            for chunk in response_stream:
-                if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    full_response += content
-                    message_placeholder.markdown(full_response + "▌")
-                    # time.sleep(0.01) # Optional: small delay for smoother visual effect
-
-            message_placeholder.markdown(full_response)
+            renderer = StreamRenderer(st.empty())
+            full_response = renderer.render(response_stream)
+            st.caption(renderer.stats_caption())
 
         st.session_state.chatbot_messages.append({"role": "assistant", "content": full_response})
 
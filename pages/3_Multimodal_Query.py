@@ -30,6 +30,11 @@ st.divider()
 st.write("### Inputs")
 text_prompt = st.text_area("Enter text prompt:", height=100)
 uploaded_file = st.file_uploader("Upload an image (optional)", type=["jpg", "jpeg", "png"])
+use_cache = st.checkbox(
+    "Reuse the previous answer for identical queries",
+    value=True,
+    help="Answer from the response cache instead of calling the model again for the same prompt and image.",
+)
 
 if uploaded_file:
     st.write("Uploaded Image Preview:")
@@ -75,6 +80,7 @@ if st.button("Submit Query"):
                             }
                         ],
                         max_tokens=1024,
+                        cache=use_cache,
                     )
                     model_response_content = response.choices[0].message.content
                     st.markdown(model_response_content)
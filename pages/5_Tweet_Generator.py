@@ -1,12 +1,16 @@
 import traceback
 
+import pandas as pd
 import streamlit as st
 from openai import APIError, BadRequestError, NotFoundError, RateLimitError
 
+from utils.api_client import get_api_client
 from utils.db_handler import DatabaseHandler
 from utils.generate_prompt import generate_prompt
+from utils.llm_cache import CachedClient, get_response_cache
 from utils.load_json import load_content_formats, load_content_types, load_personalities
-from utils.post import SocialMediaPoster
+from utils.publisher import get_publish_queue
+from utils.tweet_candidates import generate_candidates, rank_candidates
 
 try:
     from models.llm import TEXT_MODEL_OPTIONS
@@ -35,22 +39,65 @@ st.divider()
 st.write("### Tweet Generation Inputs")
 col1, col2, col3 = st.columns([2, 2, 1])
 personality = col1.selectbox("Select personality type:", load_personalities().keys(), index=0)
-content_type = col2.selectbox("Select content type:", load_content_types().keys(), index=0)
+content_types = load_content_types()
+content_type = col2.selectbox("Select content type:", content_types.keys(), index=0)
 content_format = col3.selectbox("Select content format:", load_content_formats().keys(), index=0)
 if content_format.lower() != "text":
     st.error("Currently, only text format is supported for tweet generation.")
     st.stop()
 
-text_prompt = generate_prompt(
-    personality=personality,
-    content_type=content_type,
-    content_format=content_format,
-)
+with st.expander("Multiple candidates"):
+    candidates_per_model = st.slider("Candidates per model:", min_value=1, max_value=5, value=1)
+    extra_models = st.multiselect(
+        "Also generate with:",
+        [model_name for model_name in TEXT_MODEL_OPTIONS if model_name != selected_model_name],
+        format_func=lambda model_name: TEXT_MODEL_OPTIONS[model_name].name,
+    )
 
 if "content_generated" not in st.session_state:
     st.session_state["content_generated"] = False
 if "model_response" not in st.session_state:
     st.session_state["model_response"] = ""
+if "near_duplicates" not in st.session_state:
+    st.session_state["near_duplicates"] = []
+if "candidates" not in st.session_state:
+    st.session_state["candidates"] = []
+
+# Extra attempts made when the model returns a near-duplicate of an existing tweet
+MAX_REGENERATIONS = 2
+# Best-ranked candidates offered for posting
+TOP_CANDIDATES = 3
+CANDIDATE_COLUMNS = {
+    "text": "Tweet",
+    "model_name": "Model",
+    "score": "Score",
+    "length": "Length",
+    "hashtags": "Hashtags",
+    "emojis": "Emojis",
+    "similarity": "Similarity to History",
+}
+
+
+def find_near_duplicates(tweet_text):
+    """
+    Returns (tweet_id, similarity) pairs for stored tweets that are near-duplicates of the given text.
+    """
+    near_duplicate_index = DatabaseHandler().near_duplicates
+    return near_duplicate_index.query(tweet_text)
+
+
+def candidate_targets():
+    """
+    Returns the (model_name, client) pairs to request candidates from: the selected model and any extra models.
+    """
+    targets = [(selected_model_name, client)] * candidates_per_model
+    for model_name in extra_models:
+        model_client = get_api_client(TEXT_MODEL_OPTIONS[model_name].api)
+        if model_client is None:
+            st.warning(f"Skipping {TEXT_MODEL_OPTIONS[model_name].name}: its API client is not available.")
+            continue
+        targets += [(model_name, CachedClient(model_client, get_response_cache()))] * candidates_per_model
+    return targets
 
 
 def generate_content():
@@ -59,25 +106,56 @@ def generate_content():
         st.error("API Client not available. Please check configuration.")
         st.stop()
 
+    # Built only when generating: it reads the tweet history from the database
+    text_prompt = generate_prompt(
+        personality=personality,
+        content_type=content_type,
+        content_format=content_format,
+        topic_description=content_types.get(content_type, ""),
+    )
+
     content_payload = []
     if text_prompt:
         content_payload.append({"type": "text", "text": text_prompt})
 
-    if content_payload:
+    targets = candidate_targets()
+    if content_payload and len(targets) > 1:
+        with st.spinner(f"Generating {len(targets)} candidates..."):
+            candidates, errors, elapsed = generate_candidates(targets, [{"role": "user", "content": content_payload}])
+        for model_name, error in errors:
+            st.warning(f"{TEXT_MODEL_OPTIONS[model_name].name} failed to generate a candidate: {error}")
+        st.session_state["candidates"] = rank_candidates(
+            candidates, near_duplicate_index=DatabaseHandler().near_duplicates
+        )[:TOP_CANDIDATES]
+        # Looked up now, before a candidate is saved: afterwards it would match its own stored copy
+        st.session_state["candidate_duplicates"] = [
+            find_near_duplicates(candidate.text) for candidate in st.session_state["candidates"]
+        ]
+        st.session_state["generation_stats"] = (len(candidates), elapsed)
+        if not st.session_state["candidates"]:
+            st.error("No candidates were generated.")
+            st.session_state["content_generated"] = False
+    elif content_payload:
+        st.session_state["candidates"] = []
+        st.session_state["response_model_name"] = selected_model_name
         with st.spinner("Sending query to model..."):
             try:
-                response = client.chat.completions.create(
-                    model=selected_model_name,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": content_payload,
-                        }
-                    ],
-                    max_tokens=1024,
-                )
-                model_response_content = response.choices[0].message.content
-                st.session_state["model_response"] = model_response_content
+                for _ in range(MAX_REGENERATIONS + 1):
+                    response = client.chat.completions.create(
+                        model=selected_model_name,
+                        messages=[
+                            {
+                                "role": "user",
+                                "content": content_payload,
+                            }
+                        ],
+                        max_tokens=1024,
+                    )
+                    model_response_content = response.choices[0].message.content
+                    st.session_state["model_response"] = model_response_content
+                    st.session_state["near_duplicates"] = find_near_duplicates(model_response_content)
+                    if not st.session_state["near_duplicates"]:
+                        break
 
             except RateLimitError as e:
                 st.error(f"API Rate Limit Error: {e}")
@@ -100,33 +178,73 @@ if st.button("Generate Content"):
 st.divider()
 
 if st.session_state["content_generated"]:
+    if candidates := st.session_state["candidates"]:
+        generated, elapsed = st.session_state["generation_stats"]
+        st.write("### Candidates")
+        st.caption(f"Ranked {generated} candidates generated in {elapsed:.1f}s.")
+        st.dataframe(
+            pd.DataFrame(candidates)
+            .assign(model_name=lambda df: df["model_name"].map(lambda name: TEXT_MODEL_OPTIONS[name].name))
+            .rename(columns=CANDIDATE_COLUMNS),
+            hide_index=True,
+            use_container_width=True,
+        )
+        choice = st.radio(
+            "Pick a tweet:",
+            range(len(candidates)),
+            format_func=lambda i: f"Candidate {i + 1} (score {candidates[i].score:.2f})",
+            horizontal=True,
+        )
+        st.session_state["model_response"] = candidates[choice].text
+        st.session_state["response_model_name"] = candidates[choice].model_name
+        st.session_state["near_duplicates"] = st.session_state["candidate_duplicates"][choice]
+
     model_response = st.session_state["model_response"]
     st.write("### Generated Tweet:")
     st.markdown(model_response)
 
     db_handler = DatabaseHandler()
 
-    if st.button("Post"):
-        try:
-            from utils.api_config import X_API
-
-            XPoster = SocialMediaPoster("X", api_config=X_API)
-            if tweet_status := XPoster.post(model_response):
-                if type(tweet_status) is str:
-                    st.success(f"✅ Tweet posted! [View on X]({tweet_status})")
-                else:
-                    st.success("✅ Tweet posted!")
-                tweet_id = db_handler.add_tweet(
-                    model_name=selected_model_name,
-                    personality=personality,
-                    content_type=content_type,
-                    content_format=content_format,
-                    tweet_text=model_response,
-                    posted_url=tweet_status if type(tweet_status) is str else "posted",
-                )
-            else:
-                st.error("Failed to post tweet.")
-        except Exception as e:
-            st.error(f"Failed to post tweet: {e}")
-            traceback.print_exc()  # For debugging in console if needed
+    near_duplicates = st.session_state["near_duplicates"]
+    if near_duplicates:
+        duplicate_id, similarity = near_duplicates[0]
+        st.warning(
+            f"This tweet is {similarity:.0%} similar to stored tweet #{duplicate_id} (posted or draft). "
+            "Generate again to get a different one."
+        )
+
+    # Once this response is saved and queued, posting it again would store and publish a second copy
+    already_queued = st.session_state.get("published_response") == model_response
+    if st.button("Post", disabled=bool(near_duplicates) or already_queued):
+        # Posting happens on the publishing queue's worker thread, so a slow or rate limited X API can't block the page
+        tweet_id = db_handler.add_tweet(
+            model_name=st.session_state.get("response_model_name", selected_model_name),
+            personality=personality,
+            content_type=content_type,
+            content_format=content_format,
+            tweet_text=model_response,
+        )
+        if tweet_id is None:
+            st.error("Failed to save tweet.")
+            st.stop()
+        get_publish_queue(db_handler).enqueue(tweet_id, platform="X")
+        st.session_state["published_tweet_id"] = tweet_id
+        st.session_state["published_response"] = model_response
+        st.rerun()
+
+    if published_tweet_id := st.session_state.get("published_tweet_id"):
+        job = get_publish_queue(db_handler).get_job(published_tweet_id)
+        if job is None:
             st.stop()
+        if job["status"] == "posted":
+            tweet = db_handler.get_tweet(published_tweet_id)
+            if tweet and tweet.posted_url and tweet.posted_url.startswith("http"):
+                st.success(f"✅ Tweet posted! [View on X]({tweet.posted_url})")
+            else:
+                st.success("✅ Tweet posted!")
+        elif job["status"] == "failed":
+            st.error(f"Failed to post tweet after {job['attempts']} attempts: {job['last_error']}")
+        else:
+            retry_note = f" Last error: {job['last_error']}" if job["last_error"] else ""
+            st.info(f"⏳ Tweet queued for posting (next attempt at {job['next_attempt_at']:%H:%M:%S} UTC).{retry_note}")
+            st.button("Refresh status")
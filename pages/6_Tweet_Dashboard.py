@@ -5,35 +5,99 @@ from utils.db_handler import DatabaseHandler
 
 st.set_page_config(page_title="Tweet Dashboard", page_icon="📊")
 
+PAGE_SIZE = 50
+TABLE_COLUMNS = {
+    "id": "ID",
+    "model_name": "Model",
+    "personality": "Personality",
+    "content_type": "Content Type",
+    "content_format": "Content Format",
+    "tweet_text": "Tweet Text",
+    "posted_url": "Posted URL",
+    "created_at": "Created At",
+}
+
 st.title("📊 Tweet Dashboard")
 st.caption("View and manage generated tweets.")
 
 db_handler = DatabaseHandler()
+# Changes whenever a tweet is added, updated or deleted, so cached results are reused until the data changes
+data_version = db_handler.get_data_version()
+
+
+@st.cache_data(max_entries=32)
+def load_filter_options(data_version):
+    return {column: db_handler.get_distinct_values(column) for column in ("model_name", "personality", "content_type")}
+
+
+@st.cache_data(max_entries=64)
+def load_stats(data_version, group_by, filters):
+    return pd.DataFrame(db_handler.get_tweet_stats(group_by, **dict(filters)))
+
+
+@st.cache_data(max_entries=256)
+def load_page(data_version, filters, cursor):
+    rows, next_cursor = db_handler.get_tweets_page(
+        columns=list(TABLE_COLUMNS), cursor=cursor, limit=PAGE_SIZE, **dict(filters)
+    )
+    return pd.DataFrame(rows, columns=list(TABLE_COLUMNS)).rename(columns=TABLE_COLUMNS), next_cursor
+
+
+filter_options = load_filter_options(data_version)
 
-# Fetch all tweets from the database
-tweets = db_handler.get_all_tweets()
-
-if tweets:
-    # Convert the list of Tweet objects to a list of dictionaries
-    tweet_list = []
-    for tweet in tweets:
-        tweet_list.append(
-            {
-                "ID": tweet.id,
-                "Model": tweet.model_name,
-                "Personality": tweet.personality,
-                "Content Type": tweet.content_type,
-                "Content Format": tweet.content_format,
-                "Tweet Text": tweet.tweet_text,
-                "Posted URL": tweet.posted_url,
-                "Created At": tweet.created_at,
-            }
-        )
-
-    # Convert the list of dictionaries to a Pandas DataFrame
-    df = pd.DataFrame(tweet_list)
-
-    # Display the DataFrame in Streamlit
-    st.dataframe(df, use_container_width=True)
-else:
+with st.sidebar:
+    st.header("Filters")
+    model_name = st.selectbox("Model", [None] + filter_options["model_name"], format_func=lambda v: v or "All")
+    personality = st.selectbox("Personality", [None] + filter_options["personality"], format_func=lambda v: v or "All")
+    content_type = st.selectbox(
+        "Content Type", [None] + filter_options["content_type"], format_func=lambda v: v or "All"
+    )
+    date_range = st.date_input("Created between", value=())
+
+filters = {"model_name": model_name, "personality": personality, "content_type": content_type}
+if len(date_range) == 2:
+    filters["created_after"] = pd.Timestamp(date_range[0]).to_pydatetime()
+    filters["created_before"] = (pd.Timestamp(date_range[1]) + pd.Timedelta(days=1)).to_pydatetime()
+# A sorted tuple is hashable and stable, so it can key the caches
+filters = tuple(sorted((key, value) for key, value in filters.items() if value is not None))
+
+# Start from the first page whenever the filters change
+if st.session_state.get("dashboard_filters") != filters:
+    st.session_state["dashboard_filters"] = filters
+    st.session_state["dashboard_cursors"] = [None]
+
+totals = load_stats(data_version, None, filters).iloc[0]
+
+if not totals["tweets"]:
     st.write("No tweets found in the database.")
+    st.stop()
+
+metric_col1, metric_col2, metric_col3 = st.columns(3)
+metric_col1.metric("Tweets", f"{totals['tweets']:,}")
+metric_col2.metric("Posted", f"{totals['posted']:,}")
+metric_col3.metric("Posted Rate", f"{totals['posted'] / totals['tweets']:.0%}")
+
+tab_model, tab_personality, tab_day = st.tabs(["Per Model", "Per Personality", "Per Day"])
+for tab, group_by in ((tab_model, "model_name"), (tab_personality, "personality"), (tab_day, "day")):
+    with tab:
+        stats_df = load_stats(data_version, group_by, filters)
+        stats_df["unposted"] = stats_df["tweets"] - stats_df["posted"]
+        if group_by == "day":
+            st.line_chart(stats_df, x="day", y=["posted", "unposted"])
+        else:
+            st.bar_chart(stats_df, x=group_by, y=["posted", "unposted"])
+
+st.write("### Tweets")
+
+cursors = st.session_state["dashboard_cursors"]
+page_df, next_cursor = load_page(data_version, filters, cursors[-1])
+st.dataframe(page_df, use_container_width=True, hide_index=True)
+
+nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
+if nav_col1.button("← Previous", disabled=len(cursors) == 1):
+    cursors.pop()
+    st.rerun()
+nav_col2.caption(f"Page {len(cursors)} of {-(-int(totals['tweets']) // PAGE_SIZE)}")
+if nav_col3.button("Next →", disabled=next_cursor is None):
+    cursors.append(next_cursor)
+    st.rerun()
@@ -1,7 +1,7 @@
 import streamlit as st
 from openai import APIError, BadRequestError, RateLimitError
 
-from utils.load_json import load_news_articles
+from utils.article_store import get_article_store
 
 try:
     from models.llm import TEXT_MODEL_OPTIONS
@@ -22,8 +22,16 @@ except Exception as e:
     st.exception(e)
     st.stop()
 
-personas_data = load_news_articles()
-personas = {persona["name"]: persona for persona in personas_data["personas"]}
+article_store = get_article_store()
+
+
+@st.cache_data(max_entries=4)
+def load_personas(store_version):
+    # Reloaded only when articles were added or updated (store_version changes)
+    return article_store.personas()
+
+
+personas = load_personas(article_store.get_version())
 
 
 def generate_prompt(topic, persona_name, additional_context=None):
@@ -90,6 +98,11 @@ st.write("### Article Generation Inputs")
 topic = st.text_input("Enter the topic of the article:", "The Future of AI")
 persona_name = st.selectbox("Select a persona:", personas.keys())
 additional_context = st.text_area("Additional context (optional):")
+use_cache = st.checkbox(
+    "Reuse the previous article for identical inputs",
+    value=True,
+    help="Answer from the response cache instead of calling the model again for the same topic, persona and context.",
+)
 
 if st.button("Generate Article"):
     if client is None:
@@ -104,6 +117,7 @@ if st.button("Generate Article"):
                 model=selected_model_name,
                 messages=[{"role": "user", "content": prompt}],
                 # max_tokens=1024,
+                cache=use_cache,
             )
             article_content = response.choices[0].message.content
             st.markdown(article_content, unsafe_allow_html=True)
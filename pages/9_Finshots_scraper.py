@@ -1,109 +1,62 @@
-import json
-
-import requests
 import streamlit as st
-from bs4 import BeautifulSoup
-
-from utils.load_json import load_news_articles
-
-
-def scrape_finshots(url):
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        title = soup.find("h1", class_="article-title").text.strip()
-        content = soup.find("section", class_="gh-content")
-        hr_tags = content.find_all("hr")
-        if hr_tags:
-            last_hr = hr_tags[-1]
-            for elem in last_hr.find_next_siblings():
-                elem.decompose()
-            last_hr.decompose()
-        extracted_text = content.get_text(separator="\n", strip=True)
-        return {"title": title, "content": str(extracted_text)}
-
-    except requests.exceptions.RequestException as e:
-        print(f"Request error: {e}")
-        return None
-    except AttributeError as e:
-        print(f"Attribute error (likely element not found): {e}")
-        return None
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return None
-
 
-def get_all_articles(archive_url="https://finshots.in/archive/"):
-    try:
-        response = requests.get(archive_url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
-        articles = []
-        for a_tag in soup.find_all("a", class_="post-card-image-link"):
-            article_url = a_tag["href"]
-            articles.append(article_url)
-        return articles
-    except requests.exceptions.RequestException as e:
-        print(f"Request error: {e}")
-        return []
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return []
+from utils.article_store import get_article_store
+from utils.db_handler import DatabaseHandler
+from utils.finshots import FinshotsCrawler
+from utils.url_frontier import UrlFrontier
 
 
-def save_to_json(data, filename="data/news_articles.json"):
-    """
-    Saves the scraped article to the news_articles.json file under the Finshots persona,
-    checking if the article already exists before adding it.
+@st.cache_resource(show_spinner=False)
+def get_crawler():
+    # One crawler per process, so its keep-alive connections and rate limit are shared across reruns
+    return FinshotsCrawler(frontier=UrlFrontier(DatabaseHandler()))
 
-    Args:
-        data (dict): A dictionary containing the scraped article's title and content.
-        filename (str): The path to the news_articles.json file.
-    """
-    try:
-        news_data = load_news_articles(filename)
-        finshots_persona = next((p for p in news_data["personas"] if p["name"] == "Finshots"), None)
-
-        if not finshots_persona:
-            print("Finshots persona not found in JSON data.")
-            return
-
-        article_exists = any(article["title"] == data["title"] for article in finshots_persona["articles"])
-
-        if not article_exists:
-            finshots_persona["articles"].append(data)
-            with open(filename, "w", encoding="utf-8") as file:
-                json.dump(news_data, file, indent=4, ensure_ascii=False)
-            print(f"Article '{data['title']}' added to {filename}")
-        else:
-            print(f"Article '{data['title']}' already exists in {filename}")
-
-    except FileNotFoundError:
-        print(f"File not found: {filename}")
-    except json.JSONDecodeError:
-        print(f"Error decoding JSON from file: {filename}")
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
 
+crawler = get_crawler()
+article_store = get_article_store()
 
 st.title("Finshots Article Scraper")
 
 article_url = st.text_input("Enter Finshots Article URL:")
 
-articles = get_all_articles()
-st.write(articles)
-
-if st.button("Scrape Article"):
-    for article_url in articles:
-        url = "https://finshots.in" + article_url
-        st.write(url)
-        article_data = scrape_finshots(url)
-
-        if article_data:
-            st.header(article_data["title"])
-            save_to_json(article_data)
-            st.success(f"Article '{article_data['title']}' saved successfully!")
+# The archive is only crawled when asked for, not on every page load
+if st.button("Load Archive"):
+    with st.spinner("Fetching the archive..."):
+        st.session_state["finshots_archive"] = crawler.get_article_urls()
+
+articles = st.session_state.get("finshots_archive", [])
+if articles:
+    with st.expander(f"{len(articles)} articles in the archive"):
+        st.write(articles)
+
+refresh = st.checkbox(
+    "Re-check stored articles",
+    help="Also revisit articles that were already saved (with conditional requests) to pick up edits.",
+)
+
+if st.button("Scrape Article", disabled=not (article_url or articles)):
+    urls = crawler.pending([article_url] if article_url else articles, refresh=refresh or bool(article_url))
+    if not urls:
+        st.info("All articles are already saved.")
+        st.stop()
+    progress = st.progress(0.0, text=f"Scraping {len(urls)} articles...")
+    unchanged = 0
+    for done, result in enumerate(crawler.crawl(urls), start=1):
+        progress.progress(done / len(urls), text=f"Scraped {done} of {len(urls)} articles")
+        if result.status == "unchanged":
+            unchanged += 1
+            continue
+        st.write(result.url)
+        # Replaces the stored copy of an edited article, so its new text is what gets used and searched
+        stored = article_store.upsert(result.article, url=result.url) if result.article else None
+        if stored is not None:
+            crawler.frontier.mark_ingested(result.url, result.article)
+            st.header(result.article["title"])
+            if stored:
+                st.success(f"Article '{result.article['title']}' saved successfully!")
+            else:
+                st.info(f"Article '{result.article['title']}' was updated.")
         else:
             st.error("Failed to scrape the article. Please check the URL and try again.")
+    if unchanged:
+        st.info(f"{unchanged} stored articles are unchanged.")
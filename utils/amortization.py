@@ -0,0 +1,312 @@
+from itertools import pairwise
+
+import numpy as np
+import pandas as pd
+
+SCHEDULE_COLUMNS = ["Month", "Year", "Payment", "Principal Paid", "Interest Paid", "Remaining Balance"]
+
+# Balances below this (in currency units) are treated as paid off, absorbing floating point residue
+PAYOFF_TOLERANCE = 1e-6
+
+
+def calculate_monthly_payment(principal, annual_interest_rate, years):
+    """
+    Calculates the fixed monthly mortgage payment.
+
+    Works on scalars as well as NumPy arrays; array inputs are broadcast against each other so many
+    (principal, rate, term) combinations can be evaluated in a single call.
+
+    Args:
+        principal (float | np.ndarray): The total loan amount.
+        annual_interest_rate (float | np.ndarray): The annual interest rate (as a percentage).
+        years (int | np.ndarray): The loan term in years.
+
+    Returns:
+        float | np.ndarray: The monthly payment. Zero interest rates fall back to principal / number_of_payments,
+                            and invalid terms (years <= 0) or overflowing inputs yield float('inf').
+    """
+    principal, annual_interest_rate, years = np.broadcast_arrays(
+        np.asarray(principal, dtype=float),
+        np.asarray(annual_interest_rate, dtype=float),
+        np.asarray(years, dtype=float),
+    )
+    monthly_interest_rate = (annual_interest_rate / 100) / 12
+    number_of_payments = years * 12
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        growth = (1 + monthly_interest_rate) ** number_of_payments
+        monthly_payment = np.where(
+            monthly_interest_rate == 0,
+            principal / number_of_payments,
+            principal * monthly_interest_rate * growth / (growth - 1),
+        )
+    monthly_payment = np.where((number_of_payments > 0) & np.isfinite(monthly_payment), monthly_payment, np.inf)
+
+    if monthly_payment.ndim == 0:
+        return float(monthly_payment)
+    return monthly_payment
+
+
+def remaining_balances(principal, monthly_interest_rate, monthly_payment, months):
+    """
+    Computes the outstanding balance after each of the given months using the closed-form annuity formula.
+
+    B_k = P * (1 + r)^k - M * ((1 + r)^k - 1) / r, or P - M * k when r is zero.
+
+    Args:
+        principal (float): The balance at month 0.
+        monthly_interest_rate (float): The monthly interest rate (as a fraction, e.g. 0.005).
+        monthly_payment (float): The fixed payment made at the end of every month.
+        months (np.ndarray): Month offsets (1-based) to evaluate the balance at.
+
+    Returns:
+        np.ndarray: The balance after each month in `months`, clipped at zero.
+    """
+    months = np.asarray(months, dtype=float)
+    if monthly_interest_rate == 0:
+        balances = principal - monthly_payment * months
+    else:
+        growth = (1 + monthly_interest_rate) ** months
+        balances = principal * growth - monthly_payment * (growth - 1) / monthly_interest_rate
+    return np.maximum(balances, 0.0)
+
+
+def amortization_schedule(principal, annual_interest_rate, years):
+    """
+    Builds the full month-by-month amortization schedule for a fixed-rate loan.
+
+    The schedule is computed as whole NumPy arrays (no per-month Python loop) and returned as a columnar
+    DataFrame. The final payment is trimmed so the loan is paid off exactly.
+
+    Args:
+        principal (float): The total loan amount.
+        annual_interest_rate (float): The annual interest rate (as a percentage).
+        years (int): The loan term in years.
+
+    Returns:
+        pd.DataFrame: One row per month with the columns in SCHEDULE_COLUMNS.
+    """
+    number_of_payments = int(years * 12)
+    monthly_payment = calculate_monthly_payment(principal, annual_interest_rate, years)
+    if number_of_payments <= 0 or principal <= 0 or not np.isfinite(monthly_payment):
+        return pd.DataFrame({column: np.array([], dtype=float) for column in SCHEDULE_COLUMNS})
+
+    monthly_interest_rate = (annual_interest_rate / 100) / 12
+    month = np.arange(1, number_of_payments + 1)
+    balance_after = remaining_balances(principal, monthly_interest_rate, monthly_payment, month)
+    balance_before = np.concatenate(([float(principal)], balance_after[:-1]))
+
+    interest_paid = balance_before * monthly_interest_rate
+    # The principal portion can't exceed what's left, which only matters for the last month's rounding
+    principal_paid = np.minimum(monthly_payment - interest_paid, balance_before)
+    principal_paid[-1] = balance_before[-1]
+    balance_after[-1] = 0.0
+
+    return pd.DataFrame(
+        {
+            "Month": month,
+            "Year": (month - 1) // 12 + 1,
+            "Payment": interest_paid + principal_paid,
+            "Principal Paid": principal_paid,
+            "Interest Paid": interest_paid,
+            "Remaining Balance": balance_after,
+        }
+    )
+
+
+def scenario_grid(home_value, deposits, annual_interest_rates, years):
+    """
+    Evaluates every deposit x rate x term combination in a single broadcasted computation.
+
+    Args:
+        home_value (float): The total value of the property.
+        deposits (array-like): Deposit amounts to evaluate.
+        annual_interest_rates (array-like): Annual interest rates (as percentages) to evaluate.
+        years (array-like): Loan terms in years to evaluate.
+
+    Returns:
+        pd.DataFrame: One row per combination with the loan amount, monthly payment, total payments
+                      and total interest. Combinations where the deposit exceeds the home value are dropped.
+    """
+    deposit_axis = np.asarray(deposits, dtype=float)[:, None, None]
+    rate_axis = np.asarray(annual_interest_rates, dtype=float)[None, :, None]
+    term_axis = np.asarray(years, dtype=float)[None, None, :]
+
+    loan_amount = home_value - deposit_axis
+    monthly_payment = calculate_monthly_payment(loan_amount, rate_axis, term_axis)
+    total_payments = monthly_payment * term_axis * 12
+    deposit_grid, rate_grid, term_grid = np.broadcast_arrays(deposit_axis, rate_axis, term_axis)
+    loan_grid = np.broadcast_to(loan_amount, deposit_grid.shape)
+
+    grid_df = pd.DataFrame(
+        {
+            "Deposit": deposit_grid.ravel(),
+            "Interest Rate": rate_grid.ravel(),
+            "Loan Term": term_grid.ravel().astype(int),
+            "Loan Amount": loan_grid.ravel(),
+            "Monthly Payment": monthly_payment.ravel(),
+            "Total Payments": total_payments.ravel(),
+            "Total Interest": (total_payments - loan_grid).ravel(),
+        }
+    )
+    return grid_df[(grid_df["Loan Amount"] >= 0) & np.isfinite(grid_df["Monthly Payment"])].reset_index(drop=True)
+
+
+def _amortize_segment(opening_balance, monthly_interest_rate, monthly_payment, first_month, length, last=False):
+    """
+    Amortizes one constant-rate, constant-payment segment with the closed-form balance formula.
+
+    The segment is cut short at the month the balance reaches zero, and that month's payment is trimmed. The
+    last segment of the term always closes at zero: its final payment absorbs any rounding residue, as in
+    amortization_schedule.
+
+    Returns:
+        dict: NumPy arrays for the segment's month, payment, principal, interest and closing balance columns.
+    """
+    offsets = np.arange(1, length + 1)
+    balance_after = remaining_balances(opening_balance, monthly_interest_rate, monthly_payment, offsets)
+    paid_off = np.flatnonzero(balance_after <= PAYOFF_TOLERANCE)
+    if paid_off.size:
+        offsets = offsets[: paid_off[0] + 1]
+        balance_after = balance_after[: paid_off[0] + 1]
+        balance_after[-1] = 0.0
+    elif last:
+        balance_after[-1] = 0.0
+    balance_before = np.concatenate(([float(opening_balance)], balance_after[:-1]))
+
+    interest_paid = balance_before * monthly_interest_rate
+    principal_paid = balance_before - balance_after
+    return {
+        "Month": first_month + offsets - 1,
+        "Payment": interest_paid + principal_paid,
+        "Principal Paid": principal_paid,
+        "Interest Paid": interest_paid,
+        "Remaining Balance": balance_after,
+    }
+
+
+def amortization_schedule_with_events(
+    principal,
+    annual_interest_rate,
+    years,
+    prepayments=None,
+    extra_payments=None,
+    rate_changes=None,
+    base_schedule=None,
+):
+    """
+    Builds an amortization schedule with lump-sum prepayments, recurring extra payments and rate resets.
+
+    The timeline is split into segments at every event month and each segment is amortized with the
+    closed-form balance formula, so the cost scales with the number of events rather than the number of months.
+    Rows before the first event are identical to the plain schedule; when `base_schedule` is given they are
+    reused from it and only the months from the first event onwards are recomputed.
+
+    Prepayments and extra payments keep the EMI unchanged and shorten the loan. A rate reset recomputes the EMI
+    so the remaining balance is paid off by the end of the original term.
+
+    Args:
+        principal (float): The total loan amount.
+        annual_interest_rate (float): The initial annual interest rate (as a percentage).
+        years (int): The original loan term in years.
+        prepayments (dict, optional): Maps month -> lump-sum amount paid on top of that month's EMI.
+        extra_payments (dict, optional): Maps month -> extra amount paid every month from that month on.
+                                         A later entry replaces the earlier amount (use 0 to stop).
+        rate_changes (dict, optional): Maps month -> new annual interest rate (as a percentage) charged from
+                                       that month on.
+        base_schedule (pd.DataFrame, optional): The output of amortization_schedule for the same loan.
+
+    Returns:
+        pd.DataFrame: One row per month with the columns in SCHEDULE_COLUMNS plus "Prepayment". "Payment" covers
+                      the EMI and any recurring extra payment; the lump sum is reported under "Prepayment".
+    """
+    prepayments = {max(int(month), 1): amount for month, amount in (prepayments or {}).items() if amount > 0}
+    extra_payments = {max(int(month), 1): amount for month, amount in (extra_payments or {}).items()}
+    rate_changes = {max(int(month), 1): rate for month, rate in (rate_changes or {}).items()}
+
+    number_of_payments = int(years * 12)
+    event_months = set(prepayments) | set(extra_payments) | set(rate_changes)
+    if not event_months:
+        if base_schedule is None:
+            base_schedule = amortization_schedule(principal, annual_interest_rate, years)
+        return base_schedule.assign(Prepayment=0.0)
+
+    monthly_payment = calculate_monthly_payment(principal, annual_interest_rate, years)
+    if number_of_payments <= 0 or principal <= 0 or not np.isfinite(monthly_payment):
+        return pd.DataFrame({column: np.array([], dtype=float) for column in SCHEDULE_COLUMNS + ["Prepayment"]})
+
+    # Everything before the first event follows the plain schedule
+    first_event = min(event_months)
+    if base_schedule is None:
+        base_schedule = amortization_schedule(principal, annual_interest_rate, years)
+    prefix = base_schedule.iloc[: first_event - 1]
+    segments = [{column: prefix[column].to_numpy() for column in SCHEDULE_COLUMNS if column != "Year"}]
+    segments[0]["Prepayment"] = np.zeros(len(prefix))
+    balance = float(prefix["Remaining Balance"].iloc[-1]) if len(prefix) else float(principal)
+
+    # Segments start at rate resets and extra payment changes, and right after each lump-sum prepayment
+    boundaries = sorted(
+        {first_event, number_of_payments + 1}
+        | {month for month in set(extra_payments) | set(rate_changes) if first_event <= month <= number_of_payments}
+        | {month + 1 for month in prepayments if first_event <= month < number_of_payments}
+    )
+    rate = annual_interest_rate
+    extra = 0.0
+    for start, end in pairwise(boundaries):
+        if balance <= PAYOFF_TOLERANCE:
+            break
+        if start in rate_changes:
+            rate = rate_changes[start]
+            monthly_payment = calculate_monthly_payment(balance, rate, (number_of_payments - start + 1) / 12)
+        extra = extra_payments.get(start, extra)
+
+        segment = _amortize_segment(
+            balance, (rate / 100) / 12, monthly_payment + extra, start, end - start, last=end > number_of_payments
+        )
+        segment["Prepayment"] = np.zeros(len(segment["Month"]))
+        balance = float(segment["Remaining Balance"][-1])
+
+        last_month = int(segment["Month"][-1])
+        if balance > PAYOFF_TOLERANCE and last_month in prepayments:
+            # A prepayment can't exceed the balance it pays off
+            lump_sum = min(prepayments[last_month], balance)
+            balance -= lump_sum
+            segment["Prepayment"][-1] = lump_sum
+            segment["Remaining Balance"][-1] = balance
+        segments.append(segment)
+
+    columns = {column: np.concatenate([segment[column] for segment in segments]) for column in segments[0]}
+    month = columns["Month"].astype(int)
+    return pd.DataFrame(
+        {
+            "Month": month,
+            "Year": (month - 1) // 12 + 1,
+            "Payment": columns["Payment"],
+            "Principal Paid": columns["Principal Paid"],
+            "Interest Paid": columns["Interest Paid"],
+            "Remaining Balance": columns["Remaining Balance"],
+            "Prepayment": columns["Prepayment"],
+        }
+    )
+
+
+def yearly_balances(schedule_df):
+    """
+    Rolls a monthly schedule up to the end-of-year remaining balance.
+
+    The balance only ever decreases, so the last month of each year is also that year's minimum; picking it by
+    position avoids a groupby over the whole schedule.
+
+    Args:
+        schedule_df (pd.DataFrame): A schedule as returned by amortization_schedule.
+
+    Returns:
+        pd.DataFrame: One row per year with "Year" and "Remaining Balance" columns.
+    """
+    year = schedule_df["Year"].to_numpy()
+    if not len(year):
+        return pd.DataFrame({"Year": year, "Remaining Balance": np.array([], dtype=float)})
+    year_end = np.append(np.flatnonzero(year[1:] != year[:-1]), len(year) - 1)
+    return pd.DataFrame(
+        {"Year": year[year_end], "Remaining Balance": schedule_df["Remaining Balance"].to_numpy()[year_end]}
+    )
@@ -1,11 +1,73 @@
+import importlib.util
+
+import httpx
 import streamlit as st
-from openai import APIError, APITimeoutError, OpenAI
+from openai import APIError, APITimeoutError, DefaultHttpxClient, OpenAI
+
+# One connection pool for the whole process: every session and provider shares keep-alive connections
+# instead of each Streamlit session opening its own pool and paying for fresh TLS handshakes.
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=50, keepalive_expiry=60.0)
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+# HTTP/2 needs the optional `h2` package (`httpx[http2]`); fall back to HTTP/1.1 keep-alive without it
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_client():
+    """
+    Returns the process-wide HTTP client shared by all API clients.
+
+    Returns:
+        httpx.Client: A pooled client with keep-alive (and HTTP/2 when available).
+    """
+    return DefaultHttpxClient(limits=HTTP_POOL_LIMITS, timeout=HTTP_TIMEOUT, http2=HTTP2_ENABLED)
+
+
+def build_api_client(api_config: dict, http_client=None):
+    """
+    Creates an API client for the given configuration without touching Streamlit state.
+
+    Args:
+        api_config (dict): Dictionary containing API details ('key', 'base_url', 'name').
+        http_client (httpx.Client, optional): The HTTP client to send requests through.
+                                              Defaults to the client's own connection pool.
+
+    Returns:
+        openai.OpenAI: An initialized API client.
+
+    Raises:
+        ValueError: If the configuration is incomplete or the API type is not supported.
+    """
+    api_key = api_config.get("key")
+    base_url = api_config.get("base_url") or None
+    api_name = api_config.get("name", "UnknownAPI")
+
+    if "OpenAI" in api_name or "DALL-E" in api_name or "ChatGPT" in api_name:
+        return OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+
+    if "Gemini" in api_name or "Imagen" in api_name:
+        if not base_url:
+            raise ValueError(f"Base URL is required for {api_name} but not found in config.")
+        # Attempting to use OpenAI client library for Google models. Ensure endpoint is compatible.
+        return OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+
+    raise ValueError(f"Client initialization not defined for API type: {api_name}")
+
+
+@st.cache_resource(show_spinner=False)
+def _get_shared_api_client(api_name, api_key, base_url):
+    """
+    Returns the process-wide API client for a (provider, key, base_url) triple, creating it on first use.
+    """
+    return build_api_client({"name": api_name, "key": api_key, "base_url": base_url}, http_client=get_http_client())
 
 
 def get_api_client(api_config: dict):
     """
-    Initializes and returns an API client based on the provided configuration.
-    Manages client instances in Streamlit's session state.
+    Returns the API client for the provided configuration.
+
+    Clients are shared by every session in the process (one per provider, key and base URL) and send their
+    requests through a single pooled HTTP client, so concurrent users reuse the same connections.
 
     Args:
         api_config (dict): Dictionary containing API details ('key', 'base_url', 'name').
@@ -16,52 +78,15 @@ def get_api_client(api_config: dict):
     api_key = api_config.get("key")
     base_url = api_config.get("base_url")
     api_name = api_config.get("name", "UnknownAPI")
-    client_session_key = f"api_client_{api_name}"
-    config_session_key = f"{client_session_key}_config"
-
-    # Check if a valid client already exists in session state for this config
-    if client_session_key in st.session_state:
-        stored_config = st.session_state.get(config_session_key, {})
-        # Check if key and base_url match the current requirement
-        if stored_config.get("key") == api_key and stored_config.get("base_url") == base_url:
-            return st.session_state[client_session_key]  # Return existing client
-
-    st.sidebar.info(f"Initializing API client for {api_name}...")
-    client = None
-    try:
-        if "OpenAI" in api_name or "DALL-E" in api_name or "ChatGPT" in api_name:
-            effective_base_url = base_url if base_url else None
-            client = OpenAI(api_key=api_key, base_url=effective_base_url)
-            st.session_state[client_session_key] = client
-            st.session_state[config_session_key] = {"key": api_key, "base_url": base_url, "name": api_name}
-            st.sidebar.success(f"OpenAI client for {api_name} initialized.")
-
-        elif "Gemini" in api_name or "Imagen" in api_name:
-            effective_base_url = base_url if base_url else None
-            if not effective_base_url:
-                st.error(f"Base URL is required for {api_name} but not found in config.")
-                return None
-            # Attempting to use OpenAI client library for Google models. Ensure endpoint is compatible.
-            client = OpenAI(api_key=api_key, base_url=effective_base_url)
-
-            st.session_state[client_session_key] = client
-            st.session_state[config_session_key] = {"key": api_key, "base_url": base_url, "name": api_name}
-            st.sidebar.success(f"Client for {api_name} initialized (using OpenAI library).")
-
-        else:
-            st.sidebar.error(f"Client initialization not defined for API type: {api_name}")
-            return None
-
-        return client
 
+    try:
+        return _get_shared_api_client(api_name, api_key, base_url)
+    except ValueError as e:
+        st.sidebar.error(str(e))
     except APITimeoutError as e:
         st.sidebar.error(f"API Timeout during client initialization for {api_name}: {e}")
     except APIError as e:
         st.sidebar.error(f"API Error during client initialization for {api_name}: {e}")
     except Exception as e:
         st.sidebar.error(f"Failed to initialize API client for {api_name}: {e}")
-        if client_session_key in st.session_state:
-            del st.session_state[client_session_key]
-        if config_session_key in st.session_state:
-            del st.session_state[config_session_key]
-        return None
+    return None
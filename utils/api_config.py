@@ -27,6 +27,8 @@ X_API = {
     "access_token_secret": os.getenv("X_ACCESS_TOKEN_SECRET"),
     "client_id": os.getenv("X_CLIENT_ID"),
     "client_secret": os.getenv("X_CLIENT_SECRET"),
+    # Overrides https://api.twitter.com, e.g. to point the poster at a local stub of the API
+    "base_url": os.getenv("X_API_BASE_URL"),
 }
 
 NEWS_API = {
@@ -40,3 +42,10 @@ POLYGON_API = {
     "key": os.getenv("POLYGON_API_KEY"),
     "url": os.getenv("POLYGON_API_URL", "https://api.polygon.io/"),
 }
+
+LLM_CACHE = {
+    "backend": os.getenv("LLM_CACHE_BACKEND", "memory"),  # "memory" or "sqlite"
+    "path": os.getenv("LLM_CACHE_PATH", "llm_cache.db"),
+    "ttl": os.getenv("LLM_CACHE_TTL", "86400"),  # Seconds; empty keeps entries until evicted
+    "max_entries": os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"),
+}
@@ -0,0 +1,305 @@
+"""
+Article store backed by the articles table, replacing the rewrite-the-whole-file data/news_articles.json.
+
+Usage:
+    python -m utils.article_store import data/news_articles.json
+"""
+
+import argparse
+import os
+import re
+import threading
+from collections import defaultdict
+
+from sqlalchemy import and_, func, insert, or_, select, text, update
+from sqlalchemy.exc import IntegrityError
+
+from models.article import Article
+from utils.db_handler import DatabaseHandler
+from utils.load_json import load_news_articles
+
+DEFAULT_PERSONA = "Finshots"
+LEGACY_JSON_PATH = "data/news_articles.json"
+DEFAULT_SEARCH_LIMIT = 20
+SNIPPET_TOKENS = 24  # Words of context around the matches shown in search results
+TITLE_WEIGHT = 10.0  # BM25 weight of a title match relative to a content match
+SEARCH_TOKEN_PATTERN = re.compile(r"\w+")
+
+SEARCH_QUERY = f"""
+    SELECT articles.id, articles.persona, articles.title,
+           snippet(articles_fts, 1, '**', '**', ' … ', {SNIPPET_TOKENS}) AS snippet,
+           bm25(articles_fts, {TITLE_WEIGHT}, 1.0) AS score
+    FROM articles_fts JOIN articles ON articles.id = articles_fts.rowid
+    WHERE articles_fts MATCH :match AND (:persona IS NULL OR articles.persona = :persona)
+    ORDER BY score
+    LIMIT :limit
+"""
+
+
+def fts_query(query):
+    """
+    Turns free text into an FTS5 query that matches articles containing every word.
+
+    Words are quoted so punctuation and FTS5 operators in the input are taken literally, and the last word
+    also matches as a prefix so results appear while a word is still being typed.
+
+    Args:
+        query (str): The text typed by the user.
+
+    Returns:
+        str: The FTS5 MATCH expression, or an empty string if the text has no words.
+    """
+    tokens = SEARCH_TOKEN_PATTERN.findall(query.lower())
+    terms = [f'"{token}"' for token in tokens]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+class ArticleStore:
+    """
+    Stores articles with one indexed insert each; duplicates (same persona and title, or same URL) are skipped by
+    add and replaced by upsert.
+    """
+
+    def __init__(self, db_handler):
+        """
+        Args:
+            db_handler (DatabaseHandler): The database the articles table lives in.
+        """
+        self.engine = db_handler.engine
+
+    def add(self, article, persona=DEFAULT_PERSONA, url=None):
+        """
+        Adds an article unless it is already stored.
+
+        Args:
+            article (dict): The article's 'title' and 'content'.
+            persona (str): The persona the article is an example of.
+            url (str, optional): Where the article was scraped from.
+
+        Returns:
+            bool: True if the article was added, False if it was already stored, None if it could not be saved.
+        """
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(
+                    insert(Article).values(persona=persona, title=article["title"], content=article["content"], url=url)
+                )
+            return True
+        except IntegrityError:
+            # The unique indexes found a stored copy
+            return False
+        except Exception as e:
+            print(f"Error adding article to database: {e}")
+            return None
+
+    def upsert(self, article, url, persona=DEFAULT_PERSONA):
+        """
+        Stores the current version of the article at a URL, replacing the stored title, text and persona.
+
+        An article stored without a URL (e.g. imported from JSON) under the same persona and title is taken over
+        and given the URL. The update also refreshes the article's full-text index entry.
+
+        Args:
+            article (dict): The article's 'title' and 'content'.
+            url (str): Where the article was scraped from.
+            persona (str): The persona the article is an example of.
+
+        Returns:
+            bool: True if the article was added, False if a stored copy was updated, None if it could not be saved
+                  (e.g. another URL's article already has the title).
+        """
+        values = {"persona": persona, "title": article["title"], "content": article["content"], "url": url}
+        try:
+            with self.engine.begin() as connection:
+                updated = connection.execute(update(Article).where(Article.url == url).values(**values))
+                if not updated.rowcount:
+                    updated = connection.execute(
+                        update(Article)
+                        .where(Article.persona == persona, Article.title == article["title"], Article.url.is_(None))
+                        .values(**values)
+                    )
+                if updated.rowcount:
+                    return False
+                connection.execute(insert(Article).values(**values))
+                return True
+        except Exception as e:
+            print(f"Error saving article to database: {e}")
+            return None
+
+    def add_many(self, articles, persona=DEFAULT_PERSONA):
+        """
+        Adds several articles in one transaction, skipping stored ones and repeats.
+
+        Args:
+            articles (iterable): Dicts with 'title', 'content' and optionally 'url'.
+            persona (str): The persona the articles are examples of.
+
+        Returns:
+            int: The number of articles added.
+        """
+        articles = {article["title"]: article for article in articles}
+        with self.engine.begin() as connection:
+            query = select(Article.title).where(Article.persona == persona, Article.title.in_(list(articles)))
+            existing = set(connection.scalars(query))
+            rows = [
+                {"persona": persona, "title": title, "content": article["content"], "url": article.get("url")}
+                for title, article in articles.items()
+                if title not in existing
+            ]
+            if rows:
+                connection.execute(insert(Article), rows)
+        return len(rows)
+
+    def count(self):
+        """
+        Returns the number of stored articles.
+        """
+        with self.engine.connect() as connection:
+            return connection.scalar(select(func.count()).select_from(Article))
+
+    def get_version(self):
+        """
+        Returns a value that changes whenever articles are added or updated, for keying caches.
+
+        Returns:
+            tuple: (article count, highest ID, latest updated_at).
+        """
+        with self.engine.connect() as connection:
+            return tuple(
+                connection.execute(select(func.count(), func.max(Article.id), func.max(Article.updated_at))).one()
+            )
+
+    def persona_names(self):
+        """
+        Returns the names of the personas that have articles, sorted.
+        """
+        with self.engine.connect() as connection:
+            return list(connection.scalars(select(Article.persona).distinct().order_by(Article.persona)))
+
+    def personas(self):
+        """
+        Loads every article grouped by persona, in the shape of data/news_articles.json.
+
+        Returns:
+            Dict[str, Persona]: Personas mapped by name, each with its articles in the order they were added.
+        """
+        personas = defaultdict(list)
+        query = select(Article.persona, Article.title, Article.content).order_by(Article.id)
+        with self.engine.connect() as connection:
+            for persona, title, content in connection.execute(query):
+                personas[persona].append({"title": title, "content": content})
+        return {name: {"name": name, "articles": articles} for name, articles in personas.items()}
+
+    def get(self, article_id):
+        """
+        Returns one article.
+
+        Args:
+            article_id (int): The article's ID.
+
+        Returns:
+            Row: The article's id, persona, title, url, content and created_at, or None if it doesn't exist.
+        """
+        with self.engine.connect() as connection:
+            return connection.execute(select(Article.__table__).where(Article.id == article_id)).first()
+
+    def search(self, query, limit=DEFAULT_SEARCH_LIMIT, persona=None):
+        """
+        Finds the articles that contain every word of a query, best matches first.
+
+        On SQLite this is a lookup in the articles_fts full-text index, ranked by BM25 with title matches
+        weighted above content matches. Other databases fall back to a LIKE scan ordered by recency.
+
+        Args:
+            query (str): Free text to search for.
+            limit (int): The maximum number of results.
+            persona (str, optional): Only search this persona's articles.
+
+        Returns:
+            list: Dicts with the article's id, persona and title, a snippet around the matches (with the
+                  matched words in **bold**) and a score (lower is better).
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        with self.engine.connect() as connection:
+            if connection.dialect.name == "sqlite":
+                rows = connection.execute(text(SEARCH_QUERY), {"match": match, "persona": persona, "limit": limit})
+                return [row._asdict() for row in rows]
+
+            words = SEARCH_TOKEN_PATTERN.findall(query)
+            clauses = [or_(Article.title.ilike(f"%{word}%"), Article.content.ilike(f"%{word}%")) for word in words]
+            if persona is not None:
+                clauses.append(Article.persona == persona)
+            rows = connection.execute(
+                select(Article.id, Article.persona, Article.title, Article.content)
+                .where(and_(*clauses))
+                .order_by(Article.id.desc())
+                .limit(limit)
+            )
+            return [
+                {"id": row.id, "persona": row.persona, "title": row.title, "snippet": row.content[:200], "score": 0.0}
+                for row in rows
+            ]
+
+    def import_json(self, path=LEGACY_JSON_PATH):
+        """
+        Imports the articles of a news_articles.json file. Articles that are already stored are skipped, so
+        importing the same file again is harmless.
+
+        Args:
+            path (str): The JSON file, with a list of personas and their articles.
+
+        Returns:
+            int: The number of articles added.
+        """
+        imported = 0
+        for persona in load_news_articles(path).get("personas", []):
+            imported += self.add_many(persona.get("articles", []), persona=persona["name"])
+        return imported
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_article_store(db_handler=None):
+    """
+    Returns the process-wide article store for a database.
+
+    The first time the store is used on an empty database, the articles of data/news_articles.json are
+    imported into it.
+
+    Args:
+        db_handler (DatabaseHandler, optional): The database to use. Defaults to tweets.db.
+
+    Returns:
+        ArticleStore: The store.
+    """
+    db_handler = db_handler or DatabaseHandler()
+    db_url = str(db_handler.engine.url)
+    with _stores_lock:
+        store = _stores.get(db_url)
+        if store is None:
+            store = ArticleStore(db_handler)
+            if not store.count() and os.path.exists(LEGACY_JSON_PATH):
+                print(f"Imported {store.import_json(LEGACY_JSON_PATH)} articles from {LEGACY_JSON_PATH}")
+            _stores[db_url] = store
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a news_articles.json file into the article store.")
+    parser.add_argument("action", choices=["import"])
+    parser.add_argument("path", nargs="?", default=LEGACY_JSON_PATH, help="The JSON file to import.")
+    parser.add_argument("--db", default="sqlite:///tweets.db", help="Database URL. Defaults to tweets.db.")
+    args = parser.parse_args()
+
+    store = ArticleStore(DatabaseHandler(args.db))
+    print(f"Imported {store.import_json(args.path)} articles from {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Headless batch generation of tweet drafts.
+
+Every personality x content type x format combination gets --per-combo drafts, generated with bounded
+concurrency and stored in the tweets table (unposted). Progress is checkpointed in the generation_jobs table,
+so running the same --run-id again resumes where a failed or interrupted run stopped.
+
+Usage:
+    python -m utils.batch_generate --model gpt-4o-mini --per-combo 3 --concurrency 8
+    python -m utils.batch_generate --run-id nightly-2025-05-01 --personality "The Knowledgeable Guide"
+"""
+
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+
+from sqlalchemy import and_, func, insert, or_, select, update
+
+from models.generation_job import GenerationJob
+from models.llm import TEXT_MODEL_OPTIONS
+from utils.api_client import build_api_client
+from utils.db_handler import DatabaseHandler
+from utils.generate_prompt import generate_prompt
+from utils.load_json import load_content_formats, load_content_types, load_personalities
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ATTEMPTS = 3
+# Extra attempts made when the model returns a near-duplicate of an existing tweet
+MAX_REGENERATIONS = 2
+
+# Held from the near-duplicate check until the draft is stored, so two workers can't both store the same tweet
+_store_lock = threading.Lock()
+
+
+def plan_run(db_handler, run_id, model_name, personalities, content_types, content_formats, per_combo=1):
+    """
+    Creates the jobs of a run. Jobs that already exist (from an earlier attempt at the run) are left as they are.
+
+    Args:
+        db_handler (DatabaseHandler): The database to checkpoint the run in.
+        run_id (str): Identifies the run; reuse it to resume.
+        model_name (str): The model that generates the drafts.
+        personalities (list): Personality names.
+        content_types (list): Content type names.
+        content_formats (list): Content format names.
+        per_combo (int): Drafts per personality x content type x format combination.
+
+    Returns:
+        int: The number of jobs created.
+    """
+    with db_handler.engine.begin() as connection:
+        existing = set(
+            connection.execute(
+                select(
+                    GenerationJob.personality,
+                    GenerationJob.content_type,
+                    GenerationJob.content_format,
+                    GenerationJob.slot,
+                ).where(GenerationJob.run_id == run_id)
+            ).all()
+        )
+        jobs = [
+            {
+                "run_id": run_id,
+                "model_name": model_name,
+                "personality": personality,
+                "content_type": content_type,
+                "content_format": content_format,
+                "slot": slot,
+            }
+            for personality in personalities
+            for content_type in content_types
+            for content_format in content_formats
+            for slot in range(per_combo)
+            if (personality, content_type, content_format, slot) not in existing
+        ]
+        if jobs:
+            connection.execute(insert(GenerationJob), jobs)
+    return len(jobs)
+
+
+def run_progress(db_handler, run_id):
+    """
+    Counts a run's jobs by status.
+
+    Args:
+        db_handler (DatabaseHandler): The database the run is checkpointed in.
+        run_id (str): The run.
+
+    Returns:
+        dict: Number of jobs per status.
+    """
+    query = (
+        select(GenerationJob.status, func.count()).where(GenerationJob.run_id == run_id).group_by(GenerationJob.status)
+    )
+    with db_handler.engine.connect() as connection:
+        return dict(connection.execute(query).all())
+
+
+def _generate_draft(db_handler, client, job, content_descriptions):
+    prompt = generate_prompt(
+        personality=job.personality,
+        content_type=job.content_type,
+        content_format=job.content_format,
+        topic_description=content_descriptions.get(job.content_type, ""),
+        db_handler=db_handler,
+    )
+    for _ in range(MAX_REGENERATIONS + 1):
+        response = client.chat.completions.create(
+            model=job.model_name,
+            messages=[{"role": "user", "content": [{"type": "text", "text": prompt}]}],
+            max_tokens=1024,
+        )
+        tweet_text = response.choices[0].message.content
+        if not tweet_text:
+            continue
+        with _store_lock:
+            if db_handler.near_duplicates.is_near_duplicate(tweet_text):
+                continue
+            tweet_id = db_handler.add_tweet(
+                model_name=job.model_name,
+                personality=job.personality,
+                content_type=job.content_type,
+                content_format=job.content_format,
+                tweet_text=tweet_text,
+            )
+        if tweet_id is None:
+            raise RuntimeError("The draft could not be saved")
+        return tweet_id
+    raise RuntimeError("The model only returned near-duplicates of existing tweets")
+
+
+def _finish_job(db_handler, job_id, **values):
+    with db_handler.engine.begin() as connection:
+        connection.execute(update(GenerationJob).where(GenerationJob.id == job_id).values(**values))
+
+
+def run_batch(db_handler, client, run_id, concurrency=DEFAULT_CONCURRENCY, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    Generates the drafts of every unfinished job in a run.
+
+    Jobs left in progress by an interrupted run and failed jobs with attempts left are picked up again. Each
+    finished draft is committed straight away, so at most the in-flight jobs are lost to a crash.
+
+    Args:
+        db_handler (DatabaseHandler): The database the run is checkpointed and the drafts are stored in.
+        client: The API client to generate with (e.g. from build_api_client).
+        run_id (str): The run.
+        concurrency (int): The maximum number of completions requested at once.
+        max_attempts (int): Attempts per job before it is left failed.
+
+    Returns:
+        dict: Number of jobs per status once the run is done.
+    """
+    content_descriptions = load_content_types()
+    with db_handler.engine.begin() as connection:
+        jobs = connection.execute(
+            select(GenerationJob).where(
+                GenerationJob.run_id == run_id,
+                or_(
+                    GenerationJob.status.in_(("pending", "in_progress")),
+                    and_(GenerationJob.status == "failed", GenerationJob.attempts < max_attempts),
+                ),
+            )
+        ).all()
+        connection.execute(
+            update(GenerationJob).where(GenerationJob.id.in_([job.id for job in jobs])).values(status="in_progress")
+        )
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(_generate_draft, db_handler, client, job, content_descriptions): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), start=1):
+            job = futures[future]
+            try:
+                tweet_id = future.result()
+                _finish_job(db_handler, job.id, status="done", tweet_id=tweet_id, attempts=job.attempts + 1)
+            except Exception as e:
+                print(f"Job {job.id} ({job.personality} / {job.content_type}) failed: {e}")
+                _finish_job(db_handler, job.id, status="failed", attempts=job.attempts + 1, last_error=str(e))
+            if done % 10 == 0 or done == len(jobs):
+                print(f"{done}/{len(jobs)} jobs processed")
+    return run_progress(db_handler, run_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate tweet drafts for every personality x content type x format.")
+    parser.add_argument("--model", default="gpt-4o-mini", choices=list(TEXT_MODEL_OPTIONS), help="Text model to use.")
+    parser.add_argument("--run-id", default=f"batch-{date.today():%Y-%m-%d}", help="Reuse a run ID to resume it.")
+    parser.add_argument("--personality", action="append", help="Limit to this personality (repeatable).")
+    parser.add_argument("--content-type", action="append", help="Limit to this content type (repeatable).")
+    parser.add_argument("--format", action="append", help="Content format (repeatable). Defaults to Text.")
+    parser.add_argument("--per-combo", type=int, default=1, help="Drafts per combination.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Completions in flight at once.")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS, help="Attempts per draft.")
+    parser.add_argument("--db", default="sqlite:///tweets.db", help="Database URL. Defaults to tweets.db.")
+    args = parser.parse_args()
+
+    personalities = args.personality or list(load_personalities())
+    content_types = args.content_type or list(load_content_types())
+    # Only text tweets can be generated for now
+    content_formats = args.format or ["Text"]
+    unknown = set(content_formats) - set(load_content_formats())
+    if unknown:
+        parser.error(f"Unknown content format(s): {', '.join(sorted(unknown))}")
+
+    db_handler = DatabaseHandler(args.db)
+    client = build_api_client(TEXT_MODEL_OPTIONS[args.model].api)
+    created = plan_run(
+        db_handler, args.run_id, args.model, personalities, content_types, content_formats, per_combo=args.per_combo
+    )
+    print(f"Run {args.run_id}: {created} new jobs")
+    progress = run_batch(db_handler, client, args.run_id, concurrency=args.concurrency, max_attempts=args.max_attempts)
+    print(f"Run {args.run_id}: " + ", ".join(f"{count} {status}" for status, count in sorted(progress.items())))
+
+
+if __name__ == "__main__":
+    main()
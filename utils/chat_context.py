@@ -0,0 +1,142 @@
+from functools import lru_cache
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:  # tiktoken is optional; fall back to a character-based estimate
+    _ENCODING = None
+
+# Per-message overhead for the role and separators added by the chat format
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = """
+Update the running summary of a conversation between a user and an assistant.
+
+Keep every fact, decision, name, number and open question that later turns may refer to. Write it as a compact
+paragraph in the third person. Return ONLY the updated summary.
+
+**Current summary:**
+{summary}
+
+**New turns to fold in:**
+{turns}
+""".strip()
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text):
+    """
+    Counts the tokens in a piece of text, caching the result per distinct text.
+
+    Uses tiktoken when it is installed and estimates roughly four characters per token otherwise.
+
+    Args:
+        text (str): The text to count.
+
+    Returns:
+        int: The number of tokens.
+    """
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return (len(text) + 3) // 4
+
+
+def message_tokens(message):
+    """
+    Counts the tokens a chat message contributes to a request.
+
+    Args:
+        message (dict): A chat message with "role" and "content".
+
+    Returns:
+        int: The number of tokens, including the per-message overhead.
+    """
+    content = message.get("content") or ""
+    if not isinstance(content, str):
+        content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return count_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ContextWindow:
+    """
+    Keeps the chat history sent to the model under a token budget.
+
+    The newest messages are kept verbatim; older ones fall out of the window and can be folded into a running
+    summary that is sent as a system message in their place.
+    """
+
+    def __init__(self, budget):
+        """
+        Args:
+            budget (int): The maximum number of tokens of history sent with each request.
+        """
+        self.budget = budget
+
+    def window_start(self, messages, reserved_tokens=0):
+        """
+        Finds the index of the oldest message that still fits in the budget.
+
+        The latest message is always kept, even if it alone exceeds the budget.
+
+        Args:
+            messages (list): The full chat history, oldest first.
+            reserved_tokens (int): Tokens already taken by other content (e.g. the summary).
+
+        Returns:
+            int: The index of the first message inside the window.
+        """
+        remaining = self.budget - reserved_tokens
+        start = len(messages)
+        while start > 0:
+            cost = message_tokens(messages[start - 1])
+            if cost > remaining and start < len(messages):
+                break
+            remaining -= cost
+            start -= 1
+        return start
+
+    def build(self, messages, summary=None):
+        """
+        Builds the list of messages to send for the next turn.
+
+        Args:
+            messages (list): The full chat history, oldest first.
+            summary (str, optional): A summary of the turns that fell out of the window.
+
+        Returns:
+            tuple: (api_messages, start) where start is the index of the first message kept verbatim.
+        """
+        summary_message = None
+        reserved_tokens = 0
+        if summary:
+            summary_message = {"role": "system", "content": f"Summary of the earlier conversation: {summary}"}
+            reserved_tokens = message_tokens(summary_message)
+
+        start = self.window_start(messages, reserved_tokens)
+        api_messages = list(messages[start:])
+        if summary_message and start > 0:
+            api_messages.insert(0, summary_message)
+        return api_messages, start
+
+
+def summarize_turns(client, model_name, summary, messages):
+    """
+    Folds chat messages into a running summary using the model.
+
+    Args:
+        client: The API client.
+        model_name (str): The model used to write the summary.
+        summary (str): The current summary, or an empty string.
+        messages (list): The messages to fold in, oldest first.
+
+    Returns:
+        str: The updated summary.
+    """
+    turns = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+    response = client.chat.completions.create(
+        model=model_name,
+        messages=[{"role": "user", "content": SUMMARY_PROMPT.format(summary=summary or "None", turns=turns)}],
+        temperature=0,
+    )
+    return response.choices[0].message.content.strip()
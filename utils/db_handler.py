@@ -1,7 +1,109 @@
-from sqlalchemy import create_engine
+import threading
+from datetime import datetime
+from itertools import islice
+
+from sqlalchemy import and_, bindparam, create_engine, event, func, insert, or_, select, update
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 
+from models.article import Article  # noqa: F401 - registers the articles table with Base
+from models.crawled_url import CrawledUrl  # noqa: F401 - registers the crawled_urls table with Base
+from models.generation_job import GenerationJob  # noqa: F401 - registers the generation_jobs table with Base
+from models.publish_job import PublishJob  # noqa: F401 - registers the publish_jobs table with Base
 from models.tweet import Base, Tweet
+from utils.migrations import migrate
+from utils.near_duplicate import get_near_duplicate_index
+
+# Connection pool for file-backed SQLite. With WAL, readers and the writer work on separate connections.
+SQLITE_POOL_SIZE = 10
+SQLITE_MAX_OVERFLOW = 20
+SQLITE_BUSY_TIMEOUT = 30  # Seconds a connection waits for a write lock before raising "database is locked"
+# Rows sent per executemany batch by the bulk write methods
+BULK_CHUNK_SIZE = 1000
+TWEET_FIELDS = ("model_name", "personality", "content_type", "content_format", "tweet_text", "posted_url")
+DEFAULT_PAGE_SIZE = 50
+# Dimensions get_tweet_stats can group by
+STATS_GROUPS = {
+    "model_name": Tweet.model_name,
+    "personality": Tweet.personality,
+    "content_type": Tweet.content_type,
+    "day": func.date(Tweet.created_at),
+}
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Enables WAL journaling for every new SQLite connection so readers don't block the writer (and vice versa).
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # NORMAL is durable under WAL except for the last transactions on power loss, and avoids an fsync per commit
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def tweet_filters(model_name=None, personality=None, content_type=None, created_after=None, created_before=None):
+    """
+    Builds the WHERE clauses shared by the filtered tweet queries.
+
+    Args:
+        model_name (str, optional): Only tweets generated by this model.
+        personality (str, optional): Only tweets with this personality.
+        content_type (str, optional): Only tweets with this content type.
+        created_after (datetime, optional): Only tweets created at or after this time.
+        created_before (datetime, optional): Only tweets created before this time.
+
+    Returns:
+        list: SQLAlchemy boolean clauses for the filters that are set.
+    """
+    clauses = []
+    if model_name is not None:
+        clauses.append(Tweet.model_name == model_name)
+    if personality is not None:
+        clauses.append(Tweet.personality == personality)
+    if content_type is not None:
+        clauses.append(Tweet.content_type == content_type)
+    if created_after is not None:
+        clauses.append(Tweet.created_at >= created_after)
+    if created_before is not None:
+        clauses.append(Tweet.created_at < created_before)
+    return clauses
+
+
+def get_engine(db_url):
+    """
+    Returns the process-wide engine for a database URL, creating it and its schema on first use.
+
+    Args:
+        db_url (str): The database URL.
+
+    Returns:
+        tuple: (engine, sessionmaker) shared by every DatabaseHandler for this URL.
+    """
+    with _engines_lock:
+        if db_url not in _engines:
+            url = make_url(db_url)
+            if url.get_backend_name() == "sqlite":
+                in_memory = not url.database or url.database == ":memory:"
+                engine = create_engine(
+                    url,
+                    connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT},
+                    # An in-memory database only exists on its one connection
+                    poolclass=StaticPool if in_memory else QueuePool,
+                    **({} if in_memory else {"pool_size": SQLITE_POOL_SIZE, "max_overflow": SQLITE_MAX_OVERFLOW}),
+                )
+                if not in_memory:
+                    event.listen(engine, "connect", _set_sqlite_pragmas)
+            else:
+                engine = create_engine(url, pool_pre_ping=True)
+            Base.metadata.create_all(engine)
+            migrate(engine)
+            _engines[db_url] = (engine, sessionmaker(bind=engine))
+        return _engines[db_url]
 
 
 class DatabaseHandler:
@@ -13,12 +115,23 @@ class DatabaseHandler:
         """
         Initializes the database connection.
 
+        The engine, its connection pool and the schema are shared by every handler for the same URL, so creating
+        a handler is cheap.
+
         Args:
             db_url (str): The database URL. Defaults to SQLite.
         """
-        self.engine = create_engine(db_url)
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(bind=self.engine)
+        self.engine, self.Session = get_engine(db_url)
+
+    @property
+    def near_duplicates(self):
+        """
+        The near-duplicate index over this database's tweets, kept in sync by add_tweet.
+
+        Returns:
+            NearDuplicateIndex: The process-wide index for this database.
+        """
+        return get_near_duplicate_index(self)
 
     def add_tweet(self, model_name, personality, content_type, content_format, tweet_text, posted_url=None):
         """
@@ -31,6 +144,9 @@ class DatabaseHandler:
             content_format (str): The format of the tweet.
             tweet_text (str): The generated tweet text.
             posted_url (str, optional): The URL where the tweet was posted. Defaults to None.
+
+        Returns:
+            int: The new tweet's ID, or None if it could not be saved.
         """
         session = self.Session()
         try:
@@ -44,8 +160,8 @@ class DatabaseHandler:
             )
             session.add(new_tweet)
             session.commit()
-            print(f"Tweet saved to database with id {new_tweet.id}")
-            return new_tweet.id
+            tweet_id = new_tweet.id
+            print(f"Tweet saved to database with id {tweet_id}")
         except Exception as e:
             session.rollback()
             print(f"Error adding tweet to database: {e}")
@@ -53,6 +169,9 @@ class DatabaseHandler:
         finally:
             session.close()
 
+        self._index_tweets([(tweet_id, tweet_text)])
+        return tweet_id
+
     def update_tweet_url(self, tweet_id, posted_url):
         """
         Updates the posted URL for a tweet in the database.
@@ -76,6 +195,91 @@ class DatabaseHandler:
         finally:
             session.close()
 
+    def add_tweets(self, tweets):
+        """
+        Adds many tweets to the database in a single transaction.
+
+        Rows are inserted with batched executemany statements instead of one session and commit per tweet.
+
+        Args:
+            tweets (iterable): Dictionaries with the keyword arguments of add_tweet (model_name, personality,
+                               content_type, content_format, tweet_text and optionally posted_url), plus an
+                               optional created_at to keep the original timestamp when importing tweets.
+
+        Returns:
+            list: The IDs of the inserted tweets in input order, or None if the transaction failed.
+        """
+        tweets = iter(tweets)
+        tweet_ids = []
+        indexed_texts = []
+        session = self.Session()
+        try:
+            while chunk := list(islice(tweets, BULK_CHUNK_SIZE)):
+                rows = [
+                    {
+                        **{field: tweet.get(field) for field in TWEET_FIELDS},
+                        "created_at": tweet.get("created_at") or datetime.utcnow(),
+                    }
+                    for tweet in chunk
+                ]
+                chunk_ids = session.scalars(insert(Tweet).returning(Tweet.id, sort_by_parameter_order=True), rows).all()
+                tweet_ids.extend(chunk_ids)
+                indexed_texts.extend(zip(chunk_ids, (row["tweet_text"] for row in rows), strict=True))
+            session.commit()
+            print(f"{len(tweet_ids)} tweets saved to database")
+        except Exception as e:
+            session.rollback()
+            print(f"Error adding tweets to database: {e}")
+            return None
+        finally:
+            session.close()
+
+        self._index_tweets(indexed_texts)
+        return tweet_ids
+
+    def _index_tweets(self, tweets):
+        # The tweets are already committed; a failure here must not make the caller think they weren't
+        try:
+            self.near_duplicates.add_many(tweets)
+        except Exception as e:
+            print(f"Error indexing tweets for near-duplicate detection: {e}")
+
+    def update_urls(self, posted_urls):
+        """
+        Updates the posted URL of many tweets in a single transaction.
+
+        Args:
+            posted_urls (dict): Maps tweet ID -> posted URL.
+
+        Returns:
+            int: The number of tweets updated (unknown IDs are skipped), or None if the transaction failed.
+        """
+        statement = (
+            update(Tweet.__table__)
+            .where(Tweet.__table__.c.id == bindparam("tweet_id"))
+            .values(posted_url=bindparam("new_posted_url"))
+        )
+        items = iter(posted_urls.items())
+        updated = 0
+        session = self.Session()
+        try:
+            while chunk := list(islice(items, BULK_CHUNK_SIZE)):
+                # A list of parameter sets runs the UPDATE as one executemany
+                result = session.execute(
+                    statement,
+                    [{"tweet_id": tweet_id, "new_posted_url": posted_url} for tweet_id, posted_url in chunk],
+                )
+                updated += result.rowcount
+            session.commit()
+            print(f"{updated} tweets updated with posted URLs")
+            return updated
+        except Exception as e:
+            session.rollback()
+            print(f"Error updating tweets: {e}")
+            return None
+        finally:
+            session.close()
+
     def get_all_tweets(self):
         """
         Retrieves all tweets from the database.
@@ -90,6 +294,144 @@ class DatabaseHandler:
         finally:
             session.close()
 
+    def get_tweets_page(self, columns=None, cursor=None, limit=DEFAULT_PAGE_SIZE, **filters):
+        """
+        Retrieves one page of tweets, newest first, using keyset pagination.
+
+        Only the requested columns are selected, and each page seeks straight to the cursor through the
+        (created_at, id) indexes instead of skipping rows with OFFSET, so a page costs the same wherever it is.
+
+        Args:
+            columns (list, optional): Names of the Tweet columns to return. Defaults to every column.
+            cursor (tuple, optional): The next_cursor returned with the previous page. None starts at the newest.
+            limit (int): The maximum number of tweets on the page.
+            **filters: model_name, personality, content_type, created_after and created_before, as accepted by
+                       tweet_filters.
+
+        Returns:
+            tuple: (rows, next_cursor). Rows are dictionaries keyed by column name; next_cursor is None on the
+                   last page.
+        """
+        table_columns = Tweet.__table__.c
+        columns = list(columns or table_columns.keys())
+        unknown_columns = [column for column in columns if column not in table_columns]
+        if unknown_columns:
+            raise ValueError(f"Unknown tweet columns: {', '.join(unknown_columns)}")
+        # The cursor columns are always selected so the next page can be located
+        selected = [table_columns[column] for column in dict.fromkeys(columns + ["created_at", "id"])]
+
+        statement = select(*selected).where(*tweet_filters(**filters))
+        if cursor is not None:
+            cursor_created_at, cursor_id = cursor
+            statement = statement.where(
+                or_(
+                    Tweet.created_at < cursor_created_at,
+                    and_(Tweet.created_at == cursor_created_at, Tweet.id < cursor_id),
+                )
+            )
+        statement = statement.order_by(Tweet.created_at.desc(), Tweet.id.desc()).limit(limit + 1)
+
+        session = self.Session()
+        try:
+            rows = session.execute(statement).mappings().all()
+        finally:
+            session.close()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1]["created_at"], rows[-1]["id"])
+        return [{column: row[column] for column in columns} for row in rows], next_cursor
+
+    def get_tweet_stats(self, group_by=None, **filters):
+        """
+        Counts tweets and posted tweets in the database, optionally per group.
+
+        Args:
+            group_by (str, optional): One of STATS_GROUPS ("model_name", "personality", "content_type" or "day").
+                                      None returns a single overall row.
+            **filters: Filters as accepted by tweet_filters.
+
+        Returns:
+            list: Dictionaries with "tweets" and "posted" counts (plus the group value under `group_by`).
+        """
+        counts = [func.count(Tweet.id).label("tweets"), func.count(Tweet.posted_url).label("posted")]
+        if group_by is None:
+            statement = select(*counts).where(*tweet_filters(**filters))
+        else:
+            group = STATS_GROUPS[group_by].label(group_by)
+            statement = select(group, *counts).where(*tweet_filters(**filters)).group_by(group).order_by(group)
+
+        session = self.Session()
+        try:
+            return [dict(row) for row in session.execute(statement).mappings()]
+        finally:
+            session.close()
+
+    def get_distinct_values(self, column):
+        """
+        Retrieves the distinct values of a tweet column, e.g. to offer as filter options.
+
+        Args:
+            column (str): The column name ("model_name", "personality", ...).
+
+        Returns:
+            list: The sorted non-null values.
+        """
+        table_column = Tweet.__table__.c[column]
+        session = self.Session()
+        try:
+            return list(
+                session.scalars(select(table_column).where(table_column.is_not(None)).distinct().order_by(table_column))
+            )
+        finally:
+            session.close()
+
+    def get_data_version(self):
+        """
+        Returns a value that changes whenever a tweet is added, updated or deleted, for use as a cache key.
+
+        Every part is read from an index, so this stays cheap as the table grows.
+
+        Returns:
+            tuple: (highest tweet ID, number of tweets, latest updated_at).
+        """
+        session = self.Session()
+        try:
+            # Separate subqueries let SQLite answer each MAX() with a single index lookup
+            return tuple(
+                session.execute(
+                    select(
+                        select(func.max(Tweet.id)).scalar_subquery(),
+                        select(func.count()).select_from(Tweet).scalar_subquery(),
+                        select(func.max(Tweet.updated_at)).scalar_subquery(),
+                    )
+                ).one()
+            )
+        finally:
+            session.close()
+
+    def get_tweet_history(self, after_id=0):
+        """
+        Retrieves the columns needed to index tweet history, for tweets newer than a given ID.
+
+        Args:
+            after_id (int): Only tweets with an ID greater than this are returned. Defaults to 0 (all tweets).
+
+        Returns:
+            list: (id, personality, content_type, tweet_text) rows ordered by ID.
+        """
+        session = self.Session()
+        try:
+            return (
+                session.query(Tweet.id, Tweet.personality, Tweet.content_type, Tweet.tweet_text)
+                .filter(Tweet.id > after_id)
+                .order_by(Tweet.id)
+                .all()
+            )
+        finally:
+            session.close()
+
     def get_tweet(self, tweet_id):
         """
         Retrieves a tweet from the database by ID.
@@ -0,0 +1,327 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.url_frontier import conditional_headers, content_hash
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # lxml is optional; the BeautifulSoup backends work without it
+    lxml_html = None
+
+FINSHOTS_URL = "https://finshots.in"
+ARCHIVE_PATH = "/archive/"
+USER_AGENT = "influencer-bot/1.0 (+https://finshots.in)"
+DEFAULT_CONCURRENCY = 4
+REQUESTS_PER_SECOND = 2.0  # Per host, shared by all workers
+REQUEST_TIMEOUT = (5, 30)  # Connect and read timeouts in seconds
+# Retries for connection errors and these statuses, waiting 0.5s, 1s, 2s, ... (honouring Retry-After)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Classes of the article title and body; extraction only needs these two elements
+ARTICLE_CLASSES = frozenset({"article-title", "gh-content"})
+
+# status is "scraped", "unchanged" (the stored article is still current) or "failed"
+CrawlResult = namedtuple("CrawlResult", ["url", "article", "status"])
+
+
+def build_session(pool_size=DEFAULT_CONCURRENCY):
+    """
+    Creates a keep-alive HTTP session that retries failed requests with exponential backoff.
+
+    Args:
+        pool_size (int): Connections kept open per host; at least the number of concurrent workers.
+
+    Returns:
+        requests.Session: The session.
+    """
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+class HostRateLimiter:
+    """
+    Spaces out requests to each host so that all workers together stay under a request rate.
+    """
+
+    def __init__(self, requests_per_second=REQUESTS_PER_SECOND):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """
+        Blocks until a request to the URL's host may be sent.
+
+        Args:
+            url (str): The URL about to be requested.
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _class_xpath(tag, class_name):
+    return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+def _extract_bs4(html, parser="html.parser", parse_only=None):
+    soup = BeautifulSoup(html, parser, parse_only=parse_only)
+    title = soup.find("h1", class_="article-title").text.strip()
+    content = soup.find("section", class_="gh-content")
+    # Everything after the last horizontal rule is the newsletter footer
+    hr_tags = content.find_all("hr")
+    if hr_tags:
+        last_hr = hr_tags[-1]
+        for elem in last_hr.find_next_siblings():
+            elem.decompose()
+        last_hr.decompose()
+    extracted_text = content.get_text(separator="\n", strip=True)
+    return {"title": title, "content": str(extracted_text)}
+
+
+def _is_article_part(class_value):
+    # The strainer sees the raw class attribute, e.g. "gh-content gh-canvas", before it is split into classes
+    return class_value is not None and not ARTICLE_CLASSES.isdisjoint(class_value.split())
+
+
+def _extract_bs4_strainer(html):
+    # Only the title and the article body are turned into a tree; the rest of the page is skipped
+    return _extract_bs4(
+        html,
+        parser="lxml" if lxml_html is not None else "html.parser",
+        parse_only=SoupStrainer(["h1", "section"], class_=_is_article_part),
+    )
+
+
+def _extract_lxml(html):
+    if isinstance(html, bytes):
+        # Finshots serves UTF-8; without a charset hint libxml2 would guess from the bytes
+        html = html.decode("utf-8", errors="replace")
+    tree = lxml_html.fromstring(html)
+    titles = tree.xpath(_class_xpath("h1", "article-title"))
+    sections = tree.xpath(_class_xpath("section", "gh-content"))
+    if not titles or not sections:
+        raise AttributeError("Article title or content not found")
+    content = sections[0]
+    hr_tags = content.xpath(".//hr")
+    if hr_tags:
+        last_hr = hr_tags[-1]
+        parent = last_hr.getparent()
+        # Like decompose() on the footer tags: text between them stays, the tags and their contents go
+        for elem in [last_hr, *last_hr.itersiblings()]:
+            if elem.tail and elem.tail.strip():
+                previous = elem.getprevious()
+                if previous is not None:
+                    previous.tail = (previous.tail or "") + elem.tail
+                else:
+                    parent.text = (parent.text or "") + elem.tail
+            parent.remove(elem)
+    strings = (text.strip() for text in content.xpath(".//text()[not(parent::script or parent::style)]"))
+    return {"title": "".join(titles[0].itertext()).strip(), "content": "\n".join(text for text in strings if text)}
+
+
+# Extraction backends by name; lxml is the fastest but optional
+EXTRACTION_BACKENDS = {"bs4": _extract_bs4, "bs4-strainer": _extract_bs4_strainer}
+if lxml_html is not None:
+    EXTRACTION_BACKENDS["lxml"] = _extract_lxml
+DEFAULT_EXTRACTION_BACKEND = "lxml" if lxml_html is not None else "bs4-strainer"
+
+
+def parse_article(html, backend=DEFAULT_EXTRACTION_BACKEND):
+    """
+    Extracts the title and text of a Finshots article page.
+
+    Args:
+        html (bytes | str): The article page.
+        backend (str): The extraction backend, one of EXTRACTION_BACKENDS: "bs4" (BeautifulSoup with
+                       html.parser over the whole page), "bs4-strainer" (BeautifulSoup limited to the title and
+                       gh-content section) or "lxml" (lxml.html with XPath, if lxml is installed).
+
+    Returns:
+        dict: The article's 'title' and 'content'.
+
+    Raises:
+        AttributeError: If the page doesn't have the expected article elements.
+    """
+    return EXTRACTION_BACKENDS[backend](html)
+
+
+def parse_archive(html):
+    """
+    Extracts the article links of a Finshots archive page.
+
+    Args:
+        html (bytes | str): The archive page.
+
+    Returns:
+        list: The article hrefs as they appear on the page (usually site-relative).
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    return [a_tag["href"] for a_tag in soup.find_all("a", class_="post-card-image-link")]
+
+
+class FinshotsCrawler:
+    """
+    Crawls Finshots articles with a pool of workers sharing one keep-alive session and a per-host rate limit.
+    """
+
+    def __init__(
+        self,
+        base_url=FINSHOTS_URL,
+        concurrency=DEFAULT_CONCURRENCY,
+        requests_per_second=REQUESTS_PER_SECOND,
+        session=None,
+        frontier=None,
+        extraction_backend=DEFAULT_EXTRACTION_BACKEND,
+    ):
+        """
+        Args:
+            base_url (str): The site to crawl. Point it at a local server to test against fixtures.
+            concurrency (int): The maximum number of requests in flight.
+            requests_per_second (float): The maximum request rate per host (0 for no limit).
+            session (requests.Session, optional): The session to use. Defaults to build_session(concurrency).
+            frontier (UrlFrontier, optional): Records fetched URLs, so stored articles are skipped and changed
+                                              ones are fetched with conditional requests.
+            extraction_backend (str): The parse_article backend used for article pages.
+        """
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.session = session or build_session(concurrency)
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.frontier = frontier
+        self.extraction_backend = extraction_backend
+
+    def fetch(self, url, headers=None):
+        """
+        Fetches a URL, waiting for the host's rate limit and retrying transient failures.
+
+        Args:
+            url (str): The URL to fetch.
+            headers (dict, optional): Extra request headers, e.g. conditional request validators.
+
+        Returns:
+            requests.Response: The successful (or 304 Not Modified) response.
+
+        Raises:
+            requests.exceptions.RequestException: If the request still fails after the retries.
+        """
+        self.rate_limiter.wait(url)
+        response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response
+
+    def get_article_urls(self, archive_path=ARCHIVE_PATH):
+        """
+        Lists the articles linked from the archive page.
+
+        Args:
+            archive_path (str): The archive page, relative to the base URL.
+
+        Returns:
+            list: Absolute article URLs, or an empty list if the archive could not be fetched.
+        """
+        try:
+            response = self.fetch(urljoin(self.base_url, archive_path))
+            return [urljoin(self.base_url, href) for href in parse_archive(response.content)]
+        except requests.exceptions.RequestException as e:
+            print(f"Request error: {e}")
+            return []
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+            return []
+
+    def scrape(self, url):
+        """
+        Scrapes one article.
+
+        Args:
+            url (str): The article URL (absolute, or relative to the base URL).
+
+        Returns:
+            dict: The article's 'title' and 'content', or None if it could not be scraped or is unchanged.
+        """
+        return self._scrape(urljoin(self.base_url, url)).article
+
+    def pending(self, urls, refresh=False):
+        """
+        Returns the URLs a crawl has to visit: all of them without a frontier, otherwise the ones not stored yet.
+
+        Args:
+            urls (iterable): Article URLs (absolute, or relative to the base URL).
+            refresh (bool): Revisit stored articles too (with conditional requests) to pick up edits.
+
+        Returns:
+            list: Absolute URLs without repeats.
+        """
+        urls = list(dict.fromkeys(urljoin(self.base_url, url) for url in urls))
+        if self.frontier is None or refresh:
+            return urls
+        return self.frontier.new_urls(urls)
+
+    def crawl(self, urls):
+        """
+        Scrapes several articles concurrently.
+
+        Args:
+            urls (iterable): Article URLs, usually from pending().
+
+        Yields:
+            CrawlResult: One per URL, in completion order.
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self._scrape, urljoin(self.base_url, url)) for url in urls]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _scrape(self, url):
+        entry = self.frontier.get(url) if self.frontier else None
+        try:
+            # Only a stored article can be answered with 304; otherwise the page is needed in full
+            validators = conditional_headers(entry) if entry is not None and entry.ingested else None
+            response = self.fetch(url, headers=validators)
+            if response.status_code == 304:
+                self.frontier.record(url, response)
+                return CrawlResult(url, None, "unchanged")
+            article = parse_article(response.content, backend=self.extraction_backend)
+        except requests.exceptions.RequestException as e:
+            print(f"Request error: {e}")
+            return CrawlResult(url, None, "failed")
+        except AttributeError as e:
+            print(f"Attribute error (likely element not found): {e}")
+            return CrawlResult(url, None, "failed")
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+            return CrawlResult(url, None, "failed")
+
+        if self.frontier is None:
+            return CrawlResult(url, article, "scraped")
+        unchanged = entry is not None and bool(entry.ingested) and entry.content_hash == content_hash(article)
+        # A new or changed article counts as stored, with its new hash, only once the caller has saved it
+        # (mark_ingested); until then later crawls fetch it again in full
+        self.frontier.record(url, response, ingested=unchanged)
+        return CrawlResult(url, None, "unchanged") if unchanged else CrawlResult(url, article, "scraped")
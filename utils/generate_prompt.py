@@ -1,7 +1,20 @@
 from utils.db_handler import DatabaseHandler
-
-
-def generate_prompt(personality, content_type, content_format, include_hashtags=True, include_emojis=True):
+from utils.tweet_history import get_history_index
+
+# Number of previous tweets shown to the model
+DEFAULT_HISTORY_LIMIT = 20
+
+
+def generate_prompt(
+    personality,
+    content_type,
+    content_format,
+    include_hashtags=True,
+    include_emojis=True,
+    topic_description="",
+    history_limit=DEFAULT_HISTORY_LIMIT,
+    db_handler=None,
+):
     """
     Generates a prompt for the LLM to create a tweet, emphasizing variety and clarity.
 
@@ -11,6 +24,9 @@ def generate_prompt(personality, content_type, content_format, include_hashtags=
         content_format (str): The desired style (e.g., informative, humorous).
         include_hashtags (bool): Whether to include hashtags.
         include_emojis (bool): Whether to include emojis.
+        topic_description (str): Description of the content type, used to pick the most relevant previous tweets.
+        history_limit (int): The maximum number of previous tweets included in the prompt.
+        db_handler (DatabaseHandler, optional): The database holding the previous tweets. Defaults to tweets.db.
 
     Returns:
         str: The generated prompt.
@@ -51,10 +67,10 @@ def generate_prompt(personality, content_type, content_format, include_hashtags=
         "Use emojis to enhance engagement and express your personality." if include_emojis else "Do not use emojis."
     )
 
-    # Get previous tweets from the database
-    db_handler = DatabaseHandler()
-    previous_tweets = db_handler.get_all_tweets()
-    previous_tweets_text = "\n".join(f"- {tweet.tweet_text}" for tweet in previous_tweets)
+    # Only the most relevant previous tweets are included, so the prompt doesn't grow with the history
+    history_index = get_history_index(db_handler or DatabaseHandler())
+    previous_tweets = history_index.select(personality, content_type, query=topic_description, limit=history_limit)
+    previous_tweets_text = "\n".join(f"- {tweet_text}" for tweet_text in previous_tweets)
     if not previous_tweets_text:
         previous_tweets_text = "None"
 
@@ -0,0 +1,251 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+from openai.types.chat import ChatCompletion
+
+from utils.api_config import LLM_CACHE
+
+
+def cache_key(model, messages, params):
+    """
+    Builds a content-addressed cache key for a chat completion request.
+
+    Args:
+        model (str): The model identifier.
+        messages (list): The chat messages sent to the model.
+        params (dict): Every other request parameter (temperature, max_tokens, ...).
+
+    Returns:
+        str: A SHA-256 hex digest of the canonical JSON encoding of the request.
+    """
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params}, sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU cache with per-entry expiry.
+    """
+
+    def __init__(self, max_entries=1024):
+        """
+        Args:
+            max_entries (int): The maximum number of entries kept before the least recently used are evicted.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheBackend:
+    """
+    SQLite-backed LRU cache with per-entry expiry, shared across processes and restarts.
+    """
+
+    def __init__(self, path="llm_cache.db", max_entries=10000):
+        """
+        Args:
+            path (str): Path of the SQLite database file.
+            max_entries (int): The maximum number of entries kept before the least recently used are evicted.
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS ix_responses_last_access ON responses (last_access)")
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl if ttl else None, now),
+            )
+            self._connection.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+
+
+class ResponseCache:
+    """
+    Caches chat completion responses by request content.
+    """
+
+    def __init__(self, backend, ttl=None):
+        """
+        Args:
+            backend: A backend exposing get(key), set(key, value, ttl) and clear().
+            ttl (float, optional): Seconds an entry stays valid. None keeps entries until they are evicted.
+        """
+        self.backend = backend
+        self.ttl = ttl
+
+    def get(self, key):
+        value = self.backend.get(key)
+        if value is None:
+            return None
+        return ChatCompletion.model_validate_json(value)
+
+    def set(self, key, response):
+        self.backend.set(key, response.model_dump_json(), self.ttl)
+
+    def clear(self):
+        self.backend.clear()
+
+
+class _CachedCompletions:
+    def __init__(self, completions, cache):
+        self._completions = completions
+        self._cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+
+    def create(self, *, model, messages, cache=None, **params):
+        """
+        Creates a chat completion, answering from the cache when possible.
+
+        Args:
+            model (str): The model identifier.
+            messages (list): The chat messages.
+            cache (bool, optional): True always uses the cache, False never does. By default only deterministic
+                                    requests (an explicit temperature of 0) are cached.
+            **params: Any other parameter accepted by chat.completions.create.
+
+        Returns:
+            The chat completion (or stream) returned by the API or the cache.
+        """
+        # Without an explicit temperature the provider default (1.0) applies, so the response is not deterministic
+        if cache is None:
+            cache = params.get("temperature") == 0
+        if not cache or params.get("stream"):
+            return self._completions.create(model=model, messages=messages, **params)
+
+        key = cache_key(model, messages, params)
+        response = self._cache.get(key)
+        if response is None:
+            response = self._completions.create(model=model, messages=messages, **params)
+            self._cache.set(key, response)
+        return response
+
+
+class _CachedChat:
+    def __init__(self, chat, cache):
+        self._chat = chat
+        self.completions = _CachedCompletions(chat.completions, cache)
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+
+class CachedClient:
+    """
+    Wraps an API client so chat completions go through a ResponseCache. Everything else is passed through.
+    """
+
+    def __init__(self, client, cache):
+        """
+        Args:
+            client: The API client to wrap (e.g. the one returned by get_api_client).
+            cache (ResponseCache): The cache to answer chat completions from.
+        """
+        self._client = client
+        self.chat = _CachedChat(client.chat, cache)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def build_response_cache(cache_config: dict):
+    """
+    Creates a ResponseCache from a configuration dictionary.
+
+    Args:
+        cache_config (dict): Dictionary with 'backend' ('memory' or 'sqlite'), 'path', 'ttl' and 'max_entries'.
+
+    Returns:
+        ResponseCache: The configured cache.
+
+    Raises:
+        ValueError: If the backend is not supported.
+    """
+    backend_name = cache_config.get("backend", "memory")
+    max_entries = int(cache_config.get("max_entries", 1024))
+    if backend_name == "memory":
+        backend = MemoryCacheBackend(max_entries=max_entries)
+    elif backend_name == "sqlite":
+        backend = SQLiteCacheBackend(path=cache_config.get("path", "llm_cache.db"), max_entries=max_entries)
+    else:
+        raise ValueError(f"Unsupported LLM cache backend: {backend_name}")
+    ttl = cache_config.get("ttl")
+    return ResponseCache(backend, ttl=float(ttl) if ttl else None)
+
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache():
+    """
+    Returns the process-wide response cache configured by LLM_CACHE in utils.api_config.
+    """
+    return build_response_cache(LLM_CACHE)
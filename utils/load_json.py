@@ -1,24 +1,71 @@
 import json
+import os
+import threading
+from typing import Dict, List, TypedDict
+
+try:
+    import orjson  # Optional: parses several times faster than the standard library
+except ImportError:
+    orjson = None
+
+
+class Article(TypedDict):
+    title: str
+    content: str
+
+
+class Persona(TypedDict):
+    name: str
+    articles: List[Article]
+
+
+class NewsArticles(TypedDict):
+    personas: List[Persona]
+
+
+# Parsed files by absolute path, with the (mtime, size) they were parsed at
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _parse(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def load_json(filepath):
     """
     Load JSON data from a file.
 
+    Parsed files are cached for the whole process and only parsed again when their modification time or size
+    changes, so repeated loads of an unchanged file cost a stat call. The returned data is shared between
+    callers: copy it before modifying it.
+
     Args:
         filepath (str): Path to the JSON file.
 
     Returns:
         dict: Parsed JSON data.
     """
+    path = os.path.abspath(filepath)
     try:
-        with open(filepath, "r", encoding="utf-8") as file:
-            data = json.load(file)
-            return data
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with _cache_lock:
+            cached = _cache.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with open(path, "rb") as file:
+            data = _parse(file.read())
+        with _cache_lock:
+            _cache[path] = (version, data)
+        return data
     except FileNotFoundError:
         print(f"File not found: {filepath}")
         return {}
-    except json.JSONDecodeError:
+    except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError are both ValueErrors
         print(f"Error decoding JSON from file: {filepath}")
         return {}
     except Exception as e:
@@ -26,7 +73,7 @@ def load_json(filepath):
         return {}
 
 
-def load_personalities(filepath="data/personality_type.json"):
+def load_personalities(filepath="data/personality_type.json") -> Dict[str, str]:
     """
     Load personalities from a JSON file.
 
@@ -34,25 +81,25 @@ def load_personalities(filepath="data/personality_type.json"):
         filepath (str): Path to the JSON file containing personalities.
 
     Returns:
-        dict: Dictionary of personalities.
+        Dict[str, str]: Personality names mapped to their descriptions.
     """
     return load_json(filepath)
 
 
-def load_content_types(filepath="data/content_type.json"):
+def load_content_types(filepath="data/content_type.json") -> Dict[str, str]:
     """
-    Load models from a JSON file.
+    Load content types from a JSON file.
 
     Args:
-        filepath (str): Path to the JSON file containing models.
+        filepath (str): Path to the JSON file containing content types.
 
     Returns:
-        dict: Dictionary of models.
+        Dict[str, str]: Content type names mapped to their descriptions.
     """
     return load_json(filepath)
 
 
-def load_content_formats(filepath="data/content_format.json"):
+def load_content_formats(filepath="data/content_format.json") -> Dict[str, str]:
     """
     Load content formats from a JSON file.
 
@@ -60,12 +107,12 @@ def load_content_formats(filepath="data/content_format.json"):
         filepath (str): Path to the JSON file containing content formats.
 
     Returns:
-        dict: Dictionary of content formats.
+        Dict[str, str]: Content format names mapped to their descriptions.
     """
     return load_json(filepath)
 
 
-def load_news_articles(filepath="data/news_articles.json"):
+def load_news_articles(filepath="data/news_articles.json") -> NewsArticles:
     """
     Load news articles from a JSON file.
 
@@ -73,6 +120,6 @@ def load_news_articles(filepath="data/news_articles.json"):
         filepath (str): Path to the JSON file containing news articles.
 
     Returns:
-        dict: Dictionary of news articles.
+        NewsArticles: The personas and their example articles.
     """
     return load_json(filepath)
@@ -0,0 +1,109 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, inspect, select
+
+from models.article import Article
+from models.tweet import Tweet
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+
+def _create_tweet_indexes(connection, *index_names):
+    # create_all only creates indexes together with a new table, so existing databases get them here
+    for index in Tweet.__table__.indexes:
+        if index.name in index_names:
+            index.create(connection, checkfirst=True)
+
+
+def _add_tweet_filter_indexes(connection):
+    _create_tweet_indexes(
+        connection,
+        "ix_tweets_created_at_id",
+        "ix_tweets_model_name_created_at",
+        "ix_tweets_personality_created_at",
+        "ix_tweets_content_type_created_at",
+    )
+
+
+def _add_tweet_updated_at(connection):
+    # Databases created after the column was added to the model already have it
+    if "updated_at" not in {column["name"] for column in inspect(connection).get_columns("tweets")}:
+        connection.exec_driver_sql("ALTER TABLE tweets ADD COLUMN updated_at DATETIME")
+    _create_tweet_indexes(connection, "ix_tweets_updated_at")
+
+
+def _add_article_search_index(connection):
+    # FTS5 is SQLite-only; ArticleStore.search falls back to LIKE on other databases
+    if connection.dialect.name != "sqlite":
+        return
+    # An external-content index: the text stays in articles, the triggers keep the index in step with it
+    connection.exec_driver_sql(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+        "title, content, content='articles', content_rowid='id', tokenize='porter unicode61')"
+    )
+    connection.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN "
+        "INSERT INTO articles_fts(rowid, title, content) VALUES (new.id, new.title, new.content); END"
+    )
+    connection.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN "
+        "INSERT INTO articles_fts(articles_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content); "
+        "END"
+    )
+    connection.exec_driver_sql(
+        "CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN "
+        "INSERT INTO articles_fts(articles_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content); "
+        "INSERT INTO articles_fts(rowid, title, content) VALUES (new.id, new.title, new.content); END"
+    )
+    # Index the articles stored before the index existed
+    connection.exec_driver_sql("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+
+
+def _add_article_updated_at(connection):
+    if "updated_at" not in {column["name"] for column in inspect(connection).get_columns("articles")}:
+        connection.exec_driver_sql("ALTER TABLE articles ADD COLUMN updated_at DATETIME")
+    for index in Article.__table__.indexes:
+        if index.name == "ix_articles_updated_at":
+            index.create(connection, checkfirst=True)
+
+
+# (version, description, function(connection)) in the order they must be applied
+MIGRATIONS = [
+    (1, "Add created_at and filter column indexes to tweets", _add_tweet_filter_indexes),
+    (2, "Add updated_at to tweets", _add_tweet_updated_at),
+    (3, "Add full-text search index over articles", _add_article_search_index),
+    (4, "Add updated_at to articles", _add_article_updated_at),
+]
+
+
+def migrate(engine):
+    """
+    Applies every migration the database hasn't seen yet, each in its own transaction.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): The engine of the database to migrate.
+
+    Returns:
+        list: The versions applied by this call.
+    """
+    _metadata.create_all(engine)
+    with engine.connect() as connection:
+        applied = set(connection.scalars(select(schema_migrations.c.version)))
+
+    newly_applied = []
+    for version, description, apply in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as connection:
+            apply(connection)
+            connection.execute(insert(schema_migrations).values(version=version, description=description))
+        print(f"Applied migration {version}: {description}")
+        newly_applied.append(version)
+    return newly_applied
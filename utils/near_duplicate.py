@@ -0,0 +1,261 @@
+import json
+import os
+import threading
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+SHINGLE_SIZE = 5  # Characters per shingle
+NUM_PERMUTATIONS = 64
+BANDS = 16  # LSH bands; with 4 rows each, pairs above ~0.5 similarity are likely to share a bucket
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+DEFAULT_THRESHOLD = 0.6  # Estimated Jaccard similarity at which a tweet counts as a near-duplicate
+COMPACT_SLACK = 100  # Replaced lines tolerated in the signature file before it is rewritten
+
+# Universal hashing (a * x + b) mod p with a prime just above 2**32; a < 2**31 keeps a * x inside uint64
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(seed=20240501)
+_A = _rng.integers(1, 2**31, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, 2**32, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(text):
+    """
+    Splits normalized text into overlapping character shingles.
+
+    Args:
+        text (str): The text to shingle.
+
+    Returns:
+        set: The distinct SHINGLE_SIZE-character shingles (the whole text if it is shorter).
+    """
+    normalized = " ".join("".join(ch if ch.isalnum() else " " for ch in (text or "").lower()).split())
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[i : i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(text):
+    """
+    Computes the MinHash signature of a text's shingles.
+
+    Args:
+        text (str): The text to sign.
+
+    Returns:
+        np.ndarray: NUM_PERMUTATIONS uint64 minimum hash values.
+    """
+    hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text)), dtype=np.uint64)
+    return ((_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index that finds stored tweets similar to a new one without comparing against every tweet.
+
+    Signatures are appended to a JSONL file so the index survives restarts and grows one line per tweet. A later
+    line for the same tweet ID replaces the earlier one; the file is rewritten when it holds many such lines.
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str, optional): JSONL file the signatures are persisted to. None keeps the index in memory only.
+        """
+        self.path = path
+        self.data_version = None
+        self._lock = threading.Lock()
+        self._clear()
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def add(self, tweet_id, text):
+        """
+        Indexes a tweet and persists its signature.
+
+        Args:
+            tweet_id (int): The tweet's database ID.
+            text (str): The tweet text.
+        """
+        self.add_many([(tweet_id, text)])
+
+    def add_many(self, tweets):
+        """
+        Indexes several tweets and persists their signatures with a single file append.
+
+        A tweet ID that is already indexed gets the signature of its new text, e.g. when an ID was reused.
+
+        Args:
+            tweets (iterable): (tweet_id, text) pairs.
+        """
+        with self._lock:
+            self._add_many(tweets)
+
+    def query(self, text, threshold=DEFAULT_THRESHOLD):
+        """
+        Finds indexed tweets similar to a text.
+
+        Args:
+            text (str): The text to look up.
+            threshold (float): Minimum estimated Jaccard similarity between shingle sets.
+
+        Returns:
+            list: (tweet_id, similarity) pairs, most similar first.
+        """
+        signature = minhash_signature(text)
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates |= self._buckets[band].get(key, set())
+            matches = []
+            for tweet_id in candidates:
+                similarity = float(np.mean(self._signatures[tweet_id] == signature))
+                if similarity >= threshold:
+                    matches.append((tweet_id, similarity))
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    def is_near_duplicate(self, text, threshold=DEFAULT_THRESHOLD):
+        """
+        Checks whether a text is a near-duplicate of any indexed tweet.
+
+        Args:
+            text (str): The text to check.
+            threshold (float): Minimum estimated Jaccard similarity between shingle sets.
+
+        Returns:
+            bool: True if a similar tweet is already indexed.
+        """
+        return bool(self.query(text, threshold))
+
+    def sync(self, db_handler):
+        """
+        Reconciles the index with the database.
+
+        Nothing is read while the database's data version is unchanged. Otherwise tweets stored after the last
+        indexed one (including those written by other processes) are indexed, and if the highest ID went
+        backwards or the number of indexed tweets no longer matches the table (tweets were deleted or the
+        database was reset), the index and its file are rebuilt from the database.
+
+        Args:
+            db_handler (DatabaseHandler): The database the tweets are stored in.
+        """
+        data_version = db_handler.get_data_version()
+        with self._lock:
+            if data_version == self.data_version:
+                return
+            max_id, count = data_version[0] or 0, data_version[1]
+            if max_id < self.max_id or count < len(self._signatures):
+                self._rebuild(db_handler)
+            else:
+                new_tweets = db_handler.get_tweet_history(after_id=self.max_id)
+                self._add_many((tweet_id, tweet_text) for tweet_id, _, _, tweet_text in new_tweets)
+                if len(self._signatures) != count:
+                    self._rebuild(db_handler)
+            if self.path and self._file_lines > 2 * len(self._signatures) + COMPACT_SLACK:
+                self._write_file()
+            self.data_version = data_version
+
+    def _add_many(self, tweets):
+        lines = []
+        for tweet_id, text in tweets:
+            signature = minhash_signature(text)
+            previous = self._signatures.get(tweet_id)
+            if previous is not None and np.array_equal(previous, signature):
+                continue
+            self._insert(tweet_id, signature)
+            lines.append(json.dumps({"id": tweet_id, "signature": signature.tolist()}))
+        if self.path and lines:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write("\n".join(lines) + "\n")
+            self._file_lines += len(lines)
+
+    def _rebuild(self, db_handler):
+        self._clear()
+        for tweet_id, _, _, tweet_text in db_handler.get_tweet_history():
+            self._insert(tweet_id, minhash_signature(tweet_text))
+        if self.path:
+            self._write_file()
+
+    def _write_file(self):
+        # Written to a temporary file first, so a crash never leaves a truncated index behind
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for tweet_id, signature in self._signatures.items():
+                file.write(json.dumps({"id": tweet_id, "signature": signature.tolist()}) + "\n")
+        os.replace(temp_path, self.path)
+        self._file_lines = len(self._signatures)
+
+    def _band_keys(self, signature):
+        return [signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND].tobytes() for band in range(BANDS)]
+
+    def _clear(self):
+        self.max_id = 0
+        self._signatures = {}
+        self._buckets = [defaultdict(set) for _ in range(BANDS)]
+        self._file_lines = 0
+
+    def _insert(self, tweet_id, signature):
+        previous = self._signatures.get(tweet_id)
+        if previous is not None:
+            for band, key in enumerate(self._band_keys(previous)):
+                self._buckets[band][key].discard(tweet_id)
+        self._signatures[tweet_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band][key].add(tweet_id)
+        self.max_id = max(self.max_id, tweet_id)
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                self._file_lines += 1
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A partially written last line from an interrupted append
+                    continue
+                self._insert(entry["id"], np.array(entry["signature"], dtype=np.uint64))
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def index_path_for(db_url):
+    """
+    Returns the signature file kept next to a SQLite database, or None for other databases.
+
+    Args:
+        db_url (sqlalchemy.engine.URL): The database URL.
+
+    Returns:
+        str: The path of the JSONL file (e.g. tweets.minhash.jsonl next to tweets.db), or None.
+    """
+    if db_url.get_backend_name() != "sqlite" or not db_url.database or db_url.database == ":memory:":
+        return None
+    return os.path.splitext(db_url.database)[0] + ".minhash.jsonl"
+
+
+def get_near_duplicate_index(db_handler):
+    """
+    Returns the process-wide near-duplicate index for a database, synced with any changes since the last call.
+
+    Tweets stored before the index existed or by another process (e.g. utils/batch_generate.py) are picked up
+    here, and deleted or reset tweets are dropped.
+
+    Args:
+        db_handler (DatabaseHandler): The database the tweets are stored in.
+
+    Returns:
+        NearDuplicateIndex: The index.
+    """
+    db_url = db_handler.engine.url
+    with _indexes_lock:
+        index = _indexes.get(str(db_url))
+        if index is None:
+            index = _indexes[str(db_url)] = NearDuplicateIndex(index_path_for(db_url))
+    index.sync(db_handler)
+    return index
@@ -1,34 +1,152 @@
+import threading
+from collections import namedtuple
+
+import requests
 import tweepy
+from requests.adapters import HTTPAdapter
+
+X_API_HOST = "https://api.twitter.com"
+# Header prefixes of the limits X reports: the per-endpoint 15 minute window and the 24 hour user/app caps
+X_RATE_LIMIT_HEADERS = ("x-rate-limit", "x-user-limit-24hour", "x-app-limit-24hour")
+
+RateLimit = namedtuple("RateLimit", ["remaining", "reset"])  # reset is a Unix timestamp
+
+
+def rate_limit_from_headers(headers):
+    """
+    Extracts the most restrictive rate limit from X API response headers.
+
+    Args:
+        headers (Mapping): The HTTP response headers.
+
+    Returns:
+        RateLimit: The remaining requests and when they reset, or None if the headers carry no limits.
+    """
+    limits = []
+    for prefix in X_RATE_LIMIT_HEADERS:
+        remaining = headers.get(f"{prefix}-remaining")
+        reset = headers.get(f"{prefix}-reset")
+        if remaining is not None and reset is not None:
+            limits.append(RateLimit(int(remaining), int(reset)))
+    if not limits:
+        return None
+    # The fewest remaining requests wins; among exhausted limits, the one that resets last
+    return min(limits, key=lambda limit: (limit.remaining, -limit.reset))
+
 
-from utils.api_config import X_API
+class _BaseUrlAdapter(HTTPAdapter):
+    """
+    Sends requests addressed to the X API host to another base URL (e.g. a local stub of the API).
+    """
+
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, request, **kwargs):
+        request.url = self.base_url + request.url[len(X_API_HOST) :]
+        return super().send(request, **kwargs)
 
 
 class SocialMediaPoster:
+    """
+    Base class for posting to a social network. Subclasses are registered per platform with register_platform.
+    """
+
     def __init__(self, platform, api_config):
         self.platform = platform
         self.api_config = api_config
+        self.rate_limit = None  # RateLimit reported by the platform on the last request, if any
         self.client = self.initialize_client()
 
     def initialize_client(self):
-        if self.platform == "X":
-            import tweepy
-
-            return tweepy.Client(
-                consumer_key=self.api_config.get("api_key"),
-                consumer_secret=self.api_config.get("api_key_secret"),
-                access_token=self.api_config.get("access_token"),
-                access_token_secret=self.api_config.get("access_token_secret"),
-            )
         raise NotImplementedError(f"Platform {self.platform} is not supported.")
 
     def post(self, content):
-        if self.platform == "X":
-            try:
-                response = self.client.create_tweet(text=content)
-                if X_API.get("username") is None:
-                    return True
-                return f"https://x.com/{self.api_config.get('username')}/status/{response.data['id']}"
-            except Exception as e:
-                print(f"Unexpected error: {e}")
-                raise e
         raise NotImplementedError(f"Posting to {self.platform} is not implemented.")
+
+
+_platforms = {}
+_posters = {}
+_posters_lock = threading.Lock()
+
+
+def register_platform(platform):
+    """
+    Class decorator registering a SocialMediaPoster subclass as the poster for a platform.
+
+    Args:
+        platform (str): The platform name, e.g. "X".
+
+    Returns:
+        callable: The decorator.
+    """
+
+    def decorator(poster_class):
+        _platforms[platform] = poster_class
+        return poster_class
+
+    return decorator
+
+
+def get_poster(platform, api_config):
+    """
+    Returns the process-wide poster for a platform and set of credentials, creating it on first use.
+
+    Reusing the poster keeps its authenticated client and HTTP session (and the open connection to the API)
+    instead of setting them up again for every post.
+
+    Args:
+        platform (str): The platform name, e.g. "X".
+        api_config (dict): The platform's API configuration and credentials.
+
+    Returns:
+        SocialMediaPoster: The poster.
+    """
+    if platform not in _platforms:
+        raise NotImplementedError(f"Platform {platform} is not supported.")
+    key = (platform, tuple(sorted((name, value) for name, value in api_config.items() if value is not None)))
+    with _posters_lock:
+        if key not in _posters:
+            _posters[key] = _platforms[platform](platform, api_config)
+        return _posters[key]
+
+
+@register_platform("X")
+class XPoster(SocialMediaPoster):
+    def initialize_client(self):
+        client = tweepy.Client(
+            consumer_key=self.api_config.get("api_key"),
+            consumer_secret=self.api_config.get("api_key_secret"),
+            access_token=self.api_config.get("access_token"),
+            access_token_secret=self.api_config.get("access_token_secret"),
+            # The raw response exposes the rate limit headers
+            return_type=requests.Response,
+        )
+        if self.api_config.get("base_url"):
+            client.session.mount(X_API_HOST, _BaseUrlAdapter(self.api_config["base_url"]))
+        return client
+
+    def post(self, content):
+        try:
+            response = self.client.create_tweet(text=content)
+            self.rate_limit = rate_limit_from_headers(response.headers)
+            if self.api_config.get("username") is None:
+                return True
+            return f"https://x.com/{self.api_config.get('username')}/status/{response.json()['data']['id']}"
+        except tweepy.TooManyRequests as e:
+            self.rate_limit = rate_limit_from_headers(e.response.headers)
+            raise e
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            raise e
+
+
+__all__ = [
+    "SocialMediaPoster",
+    "XPoster",
+    "RateLimit",
+    "get_poster",
+    "rate_limit_from_headers",
+    "register_platform",
+]
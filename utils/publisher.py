@@ -0,0 +1,332 @@
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+import requests
+import tweepy
+from sqlalchemy import insert, select, update
+
+from models.publish_job import PublishJob
+from models.tweet import Tweet
+from utils.api_config import X_API
+from utils.post import get_poster
+
+PLATFORM_CONFIGS = {"X": X_API}
+DEFAULT_MAX_ATTEMPTS = 5
+BASE_BACKOFF = 30  # Seconds before the first retry; doubles with every failed attempt
+MAX_BACKOFF = 3600
+IDLE_POLL_INTERVAL = 30  # Seconds the worker sleeps when nothing is due (enqueue wakes it up earlier)
+# Local pacing until the platform reports its own limits: bursts of 5 posts, then one a minute
+DEFAULT_BUCKET_CAPACITY = 5
+DEFAULT_REFILL_PER_SECOND = 1 / 60
+RESET_MARGIN = 1  # Reset times are whole seconds, so wait one more before trusting the limit has reset
+# Failures worth retrying: the platform's server errors and network problems. Anything else (bad credentials, a
+# rejected or duplicate post, an unsupported platform) would fail the same way again.
+RETRIABLE_ERRORS = (tweepy.TwitterServerError, requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class TokenBucket:
+    """
+    Token bucket pacing requests to one platform, tightened by the rate limits the platform reports.
+    """
+
+    def __init__(self, capacity=DEFAULT_BUCKET_CAPACITY, refill_per_second=DEFAULT_REFILL_PER_SECOND):
+        """
+        Args:
+            capacity (int): The largest burst of requests allowed.
+            refill_per_second (float): Tokens added back per second.
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = float(capacity)
+        self.blocked_until = 0.0  # Unix time the platform said the exhausted limit resets
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if self.blocked_until and now >= self.blocked_until:
+            # The platform's window has reset
+            self.blocked_until = 0.0
+            self.tokens = float(self.capacity)
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def wait_time(self):
+        """
+        Returns the number of seconds until a request may be made (0 if one may be made now).
+        """
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            if self.blocked_until:
+                return self.blocked_until - now
+            return max(0.0, (1 - self.tokens) / self.refill_per_second)
+
+    def try_acquire(self):
+        """
+        Takes a token if one is available.
+
+        Returns:
+            bool: True if the request may be made now.
+        """
+        with self._lock:
+            self._refill(time.time())
+            if self.blocked_until or self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+    def update(self, rate_limit):
+        """
+        Applies the rate limit reported by the platform.
+
+        Args:
+            rate_limit (RateLimit): Remaining requests and reset time from the last response, or None.
+        """
+        if rate_limit is None:
+            return
+        with self._lock:
+            self._refill(time.time())
+            self.tokens = min(self.tokens, rate_limit.remaining)
+            if rate_limit.remaining <= 0:
+                self.blocked_until = max(self.blocked_until, float(rate_limit.reset + RESET_MARGIN))
+
+
+class PublishQueue:
+    """
+    Publishing queue persisted in the tweets database and drained by a background worker thread.
+
+    Jobs survive restarts: a job left in progress by a crashed worker is picked up again when the queue starts.
+    Posts that fail with a server or network error are retried with exponential backoff and jitter, rate-limited
+    posts wait for the limit to reset, and any other failure fails the job right away. Posted tweets get their URL
+    written back with DatabaseHandler.update_tweet_url.
+    """
+
+    def __init__(self, db_handler, poster_factory=None, max_attempts=DEFAULT_MAX_ATTEMPTS, base_backoff=BASE_BACKOFF):
+        """
+        Args:
+            db_handler (DatabaseHandler): The database holding the tweets and the publish_jobs table.
+            poster_factory (callable, optional): Returns a poster (with post() and rate_limit) for a platform name.
+                                                 Called for every job; defaults to get_poster's cached poster for
+                                                 the platform's current API config.
+            max_attempts (int): Attempts before a job is marked as failed.
+            base_backoff (float): Seconds before the first retry.
+        """
+        self.db_handler = db_handler
+        self.poster_factory = poster_factory or (lambda platform: get_poster(platform, PLATFORM_CONFIGS[platform]))
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.buckets = {}
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def enqueue(self, tweet_id, platform="X"):
+        """
+        Queues a stored tweet for publishing.
+
+        Args:
+            tweet_id (int): The ID of the tweet to publish.
+            platform (str): The platform to publish to.
+
+        Returns:
+            int: The ID of the publish job.
+        """
+        with self.db_handler.engine.begin() as connection:
+            job_id = connection.execute(
+                insert(PublishJob).values(tweet_id=tweet_id, platform=platform).returning(PublishJob.id)
+            ).scalar_one()
+        self._wakeup.set()
+        return job_id
+
+    def get_job(self, tweet_id):
+        """
+        Returns the latest publish job of a tweet.
+
+        Args:
+            tweet_id (int): The ID of the tweet.
+
+        Returns:
+            dict: The job's status, attempts, next_attempt_at and last_error, or None if it was never queued.
+        """
+        query = (
+            select(PublishJob.status, PublishJob.attempts, PublishJob.next_attempt_at, PublishJob.last_error)
+            .where(PublishJob.tweet_id == tweet_id)
+            .order_by(PublishJob.id.desc())
+            .limit(1)
+        )
+        with self.db_handler.engine.connect() as connection:
+            row = connection.execute(query).first()
+        return row._asdict() if row else None
+
+    def start(self):
+        """
+        Starts the background worker, first requeueing jobs that were in progress when a previous worker stopped.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        with self.db_handler.engine.begin() as connection:
+            connection.execute(update(PublishJob).where(PublishJob.status == "in_progress").values(status="pending"))
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="publish-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stops the background worker after the job it is working on.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the worker to finish.
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def run_once(self):
+        """
+        Publishes the next due job, if any, whose platform is within its rate limit.
+
+        Returns:
+            bool: True if a job was processed.
+        """
+        job = self._claim_next()
+        if job is None:
+            return False
+        job_id, tweet_id, platform, attempts = job
+        with self.db_handler.engine.connect() as connection:
+            tweet_text = connection.execute(select(Tweet.tweet_text).where(Tweet.id == tweet_id)).scalar()
+        if tweet_text is None:
+            self._finish(job_id, "failed", error=f"Tweet {tweet_id} not found")
+            return True
+
+        bucket = self._bucket(platform)
+        if not bucket.try_acquire():
+            # Another thread used the token first; put the job back without counting the attempt
+            self._reschedule(job_id, datetime.utcnow() + timedelta(seconds=bucket.wait_time()), refund_attempt=True)
+            return True
+
+        poster = None
+        try:
+            # get_poster caches posters per platform and credentials, so changed credentials take effect here
+            poster = self.poster_factory(platform)
+            tweet_status = poster.post(tweet_text)
+            if not tweet_status:
+                raise RuntimeError("The platform did not confirm the post")
+        except tweepy.TooManyRequests as e:
+            bucket.update(poster.rate_limit)
+            retry_at = datetime.utcnow() + timedelta(seconds=max(bucket.wait_time(), self.base_backoff))
+            # Waiting out a rate limit isn't the post's fault, so it doesn't use up an attempt
+            self._reschedule(job_id, retry_at, error=str(e), refund_attempt=True)
+            return True
+        except Exception as e:
+            if poster is not None:
+                bucket.update(poster.rate_limit)
+            if attempts >= self.max_attempts or not isinstance(e, RETRIABLE_ERRORS):
+                self._finish(job_id, "failed", error=str(e))
+            else:
+                delay = min(MAX_BACKOFF, self.base_backoff * 2 ** (attempts - 1))
+                # Jitter spreads out retries of jobs that failed together
+                delay *= random.uniform(0.5, 1.0)
+                self._reschedule(job_id, datetime.utcnow() + timedelta(seconds=delay), error=str(e))
+            print(f"Publishing tweet {tweet_id} failed (attempt {attempts}): {e}")
+            return True
+
+        bucket.update(poster.rate_limit)
+        self.db_handler.update_tweet_url(tweet_id, tweet_status if isinstance(tweet_status, str) else "posted")
+        self._finish(job_id, "posted")
+        return True
+
+    def _bucket(self, platform):
+        if platform not in self.buckets:
+            self.buckets[platform] = TokenBucket()
+        return self.buckets[platform]
+
+    def _claim_next(self):
+        now = datetime.utcnow()
+        blocked = [platform for platform, bucket in self.buckets.items() if bucket.wait_time() > 0]
+        next_job = (
+            select(PublishJob.id)
+            .where(
+                PublishJob.status == "pending",
+                PublishJob.next_attempt_at <= now,
+                PublishJob.platform.not_in(blocked),
+            )
+            .order_by(PublishJob.next_attempt_at, PublishJob.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        # A single UPDATE ... RETURNING claims the job, so two workers can never take the same one
+        claim = (
+            update(PublishJob)
+            .where(PublishJob.id == next_job, PublishJob.status == "pending")
+            .values(status="in_progress", attempts=PublishJob.attempts + 1, updated_at=now)
+            .returning(PublishJob.id, PublishJob.tweet_id, PublishJob.platform, PublishJob.attempts)
+        )
+        with self.db_handler.engine.begin() as connection:
+            return connection.execute(claim).first()
+
+    def _reschedule(self, job_id, retry_at, error=None, refund_attempt=False):
+        values = {"status": "pending", "next_attempt_at": retry_at}
+        if error is not None:
+            values["last_error"] = error
+        if refund_attempt:
+            values["attempts"] = PublishJob.attempts - 1
+        with self.db_handler.engine.begin() as connection:
+            connection.execute(update(PublishJob).where(PublishJob.id == job_id).values(**values))
+
+    def _finish(self, job_id, status, error=None):
+        with self.db_handler.engine.begin() as connection:
+            connection.execute(
+                update(PublishJob).where(PublishJob.id == job_id).values(status=status, last_error=error)
+            )
+
+    def _seconds_until_due(self):
+        query = select(PublishJob.next_attempt_at).where(PublishJob.status == "pending")
+        with self.db_handler.engine.connect() as connection:
+            next_attempt_at = connection.execute(query.order_by(PublishJob.next_attempt_at).limit(1)).scalar()
+        if next_attempt_at is None:
+            return IDLE_POLL_INTERVAL
+        return max(0.0, (next_attempt_at - datetime.utcnow()).total_seconds())
+
+    def _run(self):
+        while not self._stopping.is_set():
+            # Cleared before looking for work, so a job enqueued meanwhile still wakes the wait below
+            self._wakeup.clear()
+            try:
+                if self.run_once():
+                    continue
+                timeout = self._seconds_until_due()
+                waits = [bucket.wait_time() for bucket in self.buckets.values()]
+                if timeout == 0 and waits:
+                    # A job is due but its platform is rate limited
+                    timeout = max(waits)
+            except Exception as e:
+                print(f"Publishing queue error: {e}")
+                timeout = IDLE_POLL_INTERVAL
+            self._wakeup.wait(min(max(timeout, 0.1), IDLE_POLL_INTERVAL))
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_publish_queue(db_handler):
+    """
+    Returns the process-wide publishing queue for a database, starting its worker on first use.
+
+    Args:
+        db_handler (DatabaseHandler): The database the tweets are stored in.
+
+    Returns:
+        PublishQueue: The running queue.
+    """
+    db_url = str(db_handler.engine.url)
+    with _queues_lock:
+        queue = _queues.get(db_url)
+        if queue is None:
+            queue = PublishQueue(db_handler)
+            queue.start()
+            _queues[db_url] = queue
+    return queue
@@ -0,0 +1,100 @@
+import time
+
+
+class StreamRenderer:
+    """
+    Renders a streamed chat completion into a Streamlit placeholder without redrawing on every delta.
+
+    Deltas are collected in a buffer and flushed to the UI once the time or byte budget is exhausted, so a long
+    answer costs a bounded number of redraws instead of one redraw (and websocket message) per token.
+    """
+
+    def __init__(self, placeholder, flush_interval=0.05, flush_bytes=2048, cursor="▌"):
+        """
+        Args:
+            placeholder: The Streamlit element to render into (e.g. st.empty()).
+            flush_interval (float): Maximum seconds between UI updates while the stream is running.
+            flush_bytes (int): Flush early once this many characters are buffered.
+            cursor (str): Text appended while the response is still streaming.
+        """
+        self.placeholder = placeholder
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.cursor = cursor
+
+        self.time_to_first_token = None
+        self.elapsed = None
+        self.token_count = 0
+        self.flush_count = 0
+        self._text = ""
+
+    @property
+    def tokens_per_second(self):
+        """
+        Generation speed after the first token, or None until the stream has finished.
+        """
+        if self.elapsed is None or self.time_to_first_token is None:
+            return None
+        generation_time = self.elapsed - self.time_to_first_token
+        if generation_time <= 0:
+            return None
+        return self.token_count / generation_time
+
+    def render(self, response_stream):
+        """
+        Consumes a chat completion stream and renders it.
+
+        Args:
+            response_stream: The iterator returned by chat.completions.create(..., stream=True).
+
+        Returns:
+            str: The full response text.
+        """
+        started_at = time.perf_counter()
+        last_flush = started_at
+        pending = []
+        pending_size = 0
+        usage_tokens = None
+
+        for chunk in response_stream:
+            if getattr(chunk, "usage", None) and chunk.usage.completion_tokens:
+                usage_tokens = chunk.usage.completion_tokens
+            if not (chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content):
+                continue
+
+            now = time.perf_counter()
+            if self.time_to_first_token is None:
+                self.time_to_first_token = now - started_at
+            content = chunk.choices[0].delta.content
+            pending.append(content)
+            pending_size += len(content)
+            # Each content delta is roughly one token; replaced by the reported usage when available
+            self.token_count += 1
+
+            if pending_size >= self.flush_bytes or now - last_flush >= self.flush_interval:
+                self._flush(pending, self.cursor)
+                pending.clear()
+                pending_size = 0
+                last_flush = now
+
+        self.elapsed = time.perf_counter() - started_at
+        if usage_tokens is not None:
+            self.token_count = usage_tokens
+        self._flush(pending, "")
+        return self._text
+
+    def stats_caption(self):
+        """
+        Returns a one-line summary of the stream's latency and throughput.
+        """
+        if self.time_to_first_token is None:
+            return f"No content received in {self.elapsed or 0:.2f}s"
+        caption = f"⏱️ First token in {self.time_to_first_token:.2f}s · {self.token_count} tokens in {self.elapsed:.2f}s"
+        if self.tokens_per_second is not None:
+            caption += f" · {self.tokens_per_second:.1f} tokens/s"
+        return caption
+
+    def _flush(self, pending, suffix):
+        self._text += "".join(pending)
+        self.placeholder.markdown(self._text + suffix)
+        self.flush_count += 1
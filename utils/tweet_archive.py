@@ -0,0 +1,153 @@
+"""
+Columnar snapshots of the tweets table.
+
+Usage:
+    python -m utils.tweet_archive export tweets.parquet
+    python -m utils.tweet_archive import tweets.parquet --db sqlite:///other.db
+"""
+
+import argparse
+import os
+
+from sqlalchemy import select
+
+from models.tweet import Tweet
+from utils.db_handler import DatabaseHandler
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is only needed for archiving
+    pa = None
+
+DEFAULT_CHUNK_SIZE = 50_000
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "Archiving tweets requires pyarrow. Install the archive extra with `poetry install -E archive` "
+            "or `pip install .[archive]`."
+        )
+
+
+def tweet_schema():
+    """
+    Returns the Arrow schema of the tweets table.
+
+    Returns:
+        pyarrow.Schema: One field per Tweet column.
+    """
+    _require_pyarrow()
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("model_name", pa.string()),
+            ("personality", pa.string()),
+            ("content_type", pa.string()),
+            ("content_format", pa.string()),
+            ("tweet_text", pa.string()),
+            ("posted_url", pa.string()),
+            ("created_at", pa.timestamp("us")),
+            ("updated_at", pa.timestamp("us")),
+        ]
+    )
+
+
+def _is_arrow_file(path):
+    return os.path.splitext(path)[1].lower() in ARROW_SUFFIXES
+
+
+def export_tweets(db_handler, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Streams the tweets table into a Parquet file (or an Arrow IPC file for .arrow/.feather/.ipc paths).
+
+    Rows are fetched with a server-side cursor and written one chunk at a time (one Parquet row group or Arrow
+    record batch per chunk), so memory stays bounded by the chunk size rather than the table size.
+
+    Args:
+        db_handler (DatabaseHandler): The database to export.
+        path (str): The file to write.
+        chunk_size (int): Rows fetched and written per chunk.
+
+    Returns:
+        int: The number of tweets exported.
+    """
+    _require_pyarrow()
+    schema = tweet_schema()
+    columns = [Tweet.__table__.c[name] for name in schema.names]
+    if _is_arrow_file(path):
+        writer = ipc.new_file(path, schema)
+    else:
+        writer = pq.ParquetWriter(path, schema, compression="zstd")
+
+    exported = 0
+    try:
+        with db_handler.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(
+                select(*columns).order_by(Tweet.id)
+            )
+            for rows in result.partitions():
+                batch = pa.record_batch([list(values) for values in zip(*rows, strict=True)], schema=schema)
+                writer.write_batch(batch)
+                exported += len(rows)
+    finally:
+        writer.close()
+    return exported
+
+
+def _read_batches(path, chunk_size):
+    if _is_arrow_file(path):
+        with ipc.open_file(path) as reader:
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+    else:
+        yield from pq.ParquetFile(path).iter_batches(batch_size=chunk_size)
+
+
+def import_tweets(db_handler, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Bulk-loads a Parquet or Arrow snapshot into the tweets table.
+
+    Batches are read one at a time and inserted with DatabaseHandler.add_tweets. Tweets get new IDs in the
+    target database; their original created_at timestamps are kept.
+
+    Args:
+        db_handler (DatabaseHandler): The database to import into.
+        path (str): The snapshot file to read.
+        chunk_size (int): Rows read and inserted per batch (for Parquet files).
+
+    Returns:
+        int: The number of tweets imported.
+    """
+    _require_pyarrow()
+    imported = 0
+    for batch in _read_batches(path, chunk_size):
+        tweet_ids = db_handler.add_tweets(batch.to_pylist())
+        if tweet_ids is None:
+            raise RuntimeError(f"Import stopped after {imported} tweets: a batch could not be inserted.")
+        imported += len(tweet_ids)
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import the tweets table as a columnar snapshot.")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("path", help="Snapshot file (.parquet, or .arrow/.feather/.ipc for Arrow IPC).")
+    parser.add_argument("--db", default="sqlite:///tweets.db", help="Database URL. Defaults to tweets.db.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk.")
+    args = parser.parse_args()
+
+    db_handler = DatabaseHandler(args.db)
+    if args.action == "export":
+        count = export_tweets(db_handler, args.path, chunk_size=args.chunk_size)
+        print(f"Exported {count} tweets to {args.path}")
+    else:
+        count = import_tweets(db_handler, args.path, chunk_size=args.chunk_size)
+        print(f"Imported {count} tweets from {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_TWEET_LENGTH = 280
+MAX_HASHTAGS = 3
+# Similarities below this don't count against a candidate's novelty
+NOVELTY_FLOOR = 0.2
+# Score weights; a candidate that passes every check with no similar tweet in the history scores 4
+LENGTH_WEIGHT = 1.0
+NOVELTY_WEIGHT = 2.0
+HASHTAG_WEIGHT = 0.5
+EMOJI_WEIGHT = 0.5
+
+HASHTAG_PATTERN = re.compile(r"(?<![\w#])#\w+")
+EMOJI_PATTERN = re.compile("[\U0001f300-\U0001faff\U0001f1e6-\U0001f1ff☀-➿]")
+
+ScoredCandidate = namedtuple(
+    "ScoredCandidate", ["text", "model_name", "score", "length", "hashtags", "emojis", "similarity"]
+)
+
+
+def generate_candidates(targets, messages, max_tokens=1024):
+    """
+    Requests one completion per target concurrently, so the wall time is that of the slowest call.
+
+    Args:
+        targets (list): (model_name, client) pairs. Repeat a pair to get several candidates from the same model.
+        messages (list): The chat messages sent with every request.
+        max_tokens (int): The maximum number of tokens per completion.
+
+    Returns:
+        tuple: (candidates, errors, elapsed) where candidates is a list of (model_name, text) pairs in target
+               order, errors a list of (model_name, exception) pairs and elapsed the wall time in seconds.
+    """
+
+    def request(target):
+        model_name, client = target
+        response = client.chat.completions.create(model=model_name, messages=messages, max_tokens=max_tokens)
+        return response.choices[0].message.content
+
+    start = time.perf_counter()
+    candidates, errors = [], []
+    # The clients are blocking; threads let the requests wait on the network together
+    with ThreadPoolExecutor(max_workers=max(1, len(targets))) as executor:
+        futures = [(target[0], executor.submit(request, target)) for target in targets]
+        for model_name, future in futures:
+            try:
+                candidates.append((model_name, future.result()))
+            except Exception as e:
+                errors.append((model_name, e))
+    return candidates, errors, time.perf_counter() - start
+
+
+def score_candidate(text, model_name, include_hashtags=True, include_emojis=True, near_duplicate_index=None):
+    """
+    Scores a generated tweet on length, novelty against the stored tweets and the hashtag and emoji rules.
+
+    Args:
+        text (str): The generated tweet.
+        model_name (str): The model that generated it.
+        include_hashtags (bool): Whether the tweet should have 1 to MAX_HASHTAGS hashtags (or none if False).
+        include_emojis (bool): Whether the tweet should use emojis (or none if False).
+        near_duplicate_index (NearDuplicateIndex, optional): Index of the stored tweets to measure novelty against.
+
+    Returns:
+        ScoredCandidate: The tweet with its score and the measurements behind it.
+    """
+    text = (text or "").strip()
+    hashtags = len(HASHTAG_PATTERN.findall(text))
+    emojis = len(EMOJI_PATTERN.findall(text))
+    similarity = 0.0
+    if near_duplicate_index is not None:
+        matches = near_duplicate_index.query(text, threshold=NOVELTY_FLOOR)
+        similarity = matches[0][1] if matches else 0.0
+
+    score = NOVELTY_WEIGHT * (1 - similarity)
+    if 0 < len(text) <= MAX_TWEET_LENGTH:
+        score += LENGTH_WEIGHT
+    if (1 <= hashtags <= MAX_HASHTAGS) if include_hashtags else hashtags == 0:
+        score += HASHTAG_WEIGHT
+    if (emojis > 0) if include_emojis else emojis == 0:
+        score += EMOJI_WEIGHT
+    return ScoredCandidate(text, model_name, score, len(text), hashtags, emojis, similarity)
+
+
+def rank_candidates(candidates, include_hashtags=True, include_emojis=True, near_duplicate_index=None):
+    """
+    Scores generated tweets and orders them best first, dropping exact repeats.
+
+    Args:
+        candidates (list): (model_name, text) pairs as returned by generate_candidates.
+        include_hashtags (bool): Whether the tweets should have hashtags.
+        include_emojis (bool): Whether the tweets should use emojis.
+        near_duplicate_index (NearDuplicateIndex, optional): Index of the stored tweets to measure novelty against.
+
+    Returns:
+        list: ScoredCandidate tuples, highest score first.
+    """
+    scored = {}
+    for model_name, text in candidates:
+        candidate = score_candidate(text, model_name, include_hashtags, include_emojis, near_duplicate_index)
+        if candidate.text and candidate.text not in scored:
+            scored[candidate.text] = candidate
+    return sorted(scored.values(), key=lambda candidate: candidate.score, reverse=True)
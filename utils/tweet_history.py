@@ -0,0 +1,165 @@
+import heapq
+import re
+import threading
+from collections import defaultdict
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# Words too common to say anything about what a tweet is about
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with "
+    "you your our we i me my so just".split()
+)
+# Tweets whose normalized text starts the same way count as repeats of each other
+DEDUP_PREFIX_LENGTH = 60
+
+
+def tokenize(text):
+    """
+    Splits text into lowercase word tokens, dropping stop words and one-letter tokens.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        set: The distinct tokens.
+    """
+    return {
+        token for token in TOKEN_PATTERN.findall((text or "").lower()) if len(token) > 1 and token not in STOP_WORDS
+    }
+
+
+def dedup_prefix(text):
+    """
+    Returns the normalized leading text used to detect repeated tweets.
+
+    Args:
+        text (str): The tweet text.
+
+    Returns:
+        str: The first DEDUP_PREFIX_LENGTH characters of the text, lowercased with whitespace collapsed.
+    """
+    return " ".join((text or "").lower().split())[:DEDUP_PREFIX_LENGTH]
+
+
+class TweetHistoryIndex:
+    """
+    In-memory index over stored tweets for picking the most relevant history to show the model.
+
+    The index is refreshed incrementally: each refresh only loads tweets added since the previous one. When
+    tweets were deleted or IDs reused (e.g. the database was reset), it is rebuilt from scratch instead.
+    """
+
+    def __init__(self):
+        self.data_version = None
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self.last_id = 0
+        self._tweets = {}
+        self._postings = defaultdict(set)
+        self._by_personality = defaultdict(set)
+        self._by_content_type = defaultdict(set)
+
+    def _load(self, db_handler):
+        for tweet_id, personality, content_type, tweet_text in db_handler.get_tweet_history(after_id=self.last_id):
+            self._tweets[tweet_id] = tweet_text
+            for token in tokenize(tweet_text):
+                self._postings[token].add(tweet_id)
+            self._by_personality[personality].add(tweet_id)
+            self._by_content_type[content_type].add(tweet_id)
+            self.last_id = max(self.last_id, tweet_id)
+
+    def __len__(self):
+        return len(self._tweets)
+
+    def refresh(self, db_handler):
+        """
+        Brings the index up to date with the database.
+
+        Nothing is read while the database's data version is unchanged. Otherwise tweets stored since the last
+        refresh are added, and if the highest ID went backwards or the tweet count no longer adds up (tweets
+        were deleted or IDs reused), the index is rebuilt.
+
+        Args:
+            db_handler (DatabaseHandler): The database to read tweets from.
+        """
+        data_version = db_handler.get_data_version()
+        with self._lock:
+            if data_version == self.data_version:
+                return
+            max_id, count = data_version[0] or 0, data_version[1]
+            if max_id < self.last_id or count < len(self._tweets):
+                self._clear()
+            self._load(db_handler)
+            if len(self._tweets) != count:
+                self._clear()
+                self._load(db_handler)
+            self.data_version = data_version
+
+    def select(self, personality, content_type, query="", limit=20):
+        """
+        Picks the tweets most relevant to a generation request.
+
+        Tweets score by matching content type (2 points), personality (1 point) and the share of query tokens
+        they contain; ties go to the most recent tweet. Tweets that repeat the opening of a higher-ranked tweet
+        are skipped, and the remainder of the limit is filled with the most recent tweets.
+
+        Args:
+            personality (str): The personality the tweet will be written in.
+            content_type (str): The content type of the tweet.
+            query (str): Free text describing the tweet (e.g. the content type description).
+            limit (int): The maximum number of tweets to return.
+
+        Returns:
+            list: Up to `limit` tweet texts, most relevant first.
+        """
+        with self._lock:
+            query_tokens = tokenize(f"{personality} {content_type} {query}")
+            scores = defaultdict(float)
+            for tweet_id in self._by_content_type.get(content_type, ()):
+                scores[tweet_id] += 2.0
+            for tweet_id in self._by_personality.get(personality, ()):
+                scores[tweet_id] += 1.0
+            for token in query_tokens:
+                for tweet_id in self._postings.get(token, ()):
+                    scores[tweet_id] += 1.0 / len(query_tokens)
+
+            # Leave headroom for tweets dropped as repeats
+            ranked = heapq.nlargest(limit * 4, scores, key=lambda tweet_id: (scores[tweet_id], tweet_id))
+            if len(ranked) < limit:
+                # Top up with the most recent tweets that didn't match at all
+                ranked.extend(heapq.nlargest(limit * 4, self._tweets.keys() - scores.keys()))
+
+            selected = []
+            seen_prefixes = set()
+            for tweet_id in ranked:
+                prefix = dedup_prefix(self._tweets[tweet_id])
+                if prefix in seen_prefixes:
+                    continue
+                seen_prefixes.add(prefix)
+                selected.append(self._tweets[tweet_id])
+                if len(selected) >= limit:
+                    break
+            return selected
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_history_index(db_handler):
+    """
+    Returns the process-wide history index for a database, refreshed with any tweets added since the last call.
+
+    Args:
+        db_handler (DatabaseHandler): The database the tweets are stored in.
+
+    Returns:
+        TweetHistoryIndex: The up-to-date index.
+    """
+    db_url = str(db_handler.engine.url)
+    with _indexes_lock:
+        index = _indexes.setdefault(db_url, TweetHistoryIndex())
+    index.refresh(db_handler)
+    return index
@@ -0,0 +1,121 @@
+import hashlib
+from datetime import datetime
+from itertools import islice
+
+from sqlalchemy import insert, select, update
+
+from models.crawled_url import CrawledUrl
+
+# URLs looked up per IN (...) query, below SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+def content_hash(article):
+    """
+    Hashes an article's extracted title and text, ignoring page markup that changes between fetches.
+
+    Args:
+        article (dict): The article's 'title' and 'content'.
+
+    Returns:
+        str: The hex SHA-256 digest.
+    """
+    return hashlib.sha256(f"{article['title']}\n{article['content']}".encode("utf-8")).hexdigest()
+
+
+def conditional_headers(entry):
+    """
+    Builds the validators that let the server answer 304 Not Modified for an unchanged page.
+
+    Args:
+        entry (Row): The URL's crawled_urls row from UrlFrontier.get, or None.
+
+    Returns:
+        dict: If-None-Match and/or If-Modified-Since headers (empty if nothing is recorded).
+    """
+    headers = {}
+    if entry is not None and entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry is not None and entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
+
+
+class UrlFrontier:
+    """
+    Persistent record of crawled URLs, used to skip stored articles and to send conditional requests.
+    """
+
+    def __init__(self, db_handler):
+        """
+        Args:
+            db_handler (DatabaseHandler): The database the crawled_urls table lives in.
+        """
+        self.engine = db_handler.engine
+
+    def new_urls(self, urls):
+        """
+        Filters out URLs whose article is already stored.
+
+        Args:
+            urls (iterable): Absolute URLs.
+
+        Returns:
+            list: The URLs not ingested yet, in their original order and without repeats.
+        """
+        urls = list(dict.fromkeys(urls))
+        ingested = set()
+        with self.engine.connect() as connection:
+            iterator = iter(urls)
+            while chunk := list(islice(iterator, LOOKUP_CHUNK_SIZE)):
+                query = select(CrawledUrl.url).where(CrawledUrl.url.in_(chunk), CrawledUrl.ingested.is_(True))
+                ingested.update(connection.scalars(query))
+        return [url for url in urls if url not in ingested]
+
+    def get(self, url):
+        """
+        Returns what is recorded about a URL.
+
+        Args:
+            url (str): The URL.
+
+        Returns:
+            Row: The crawled_urls row (etag, last_modified, content_hash, ...), or None if it was never fetched.
+        """
+        with self.engine.connect() as connection:
+            return connection.execute(select(CrawledUrl.__table__).where(CrawledUrl.url == url)).first()
+
+    def mark_ingested(self, url, article=None):
+        """
+        Records that a URL's article has been stored, so later crawls skip it.
+
+        Args:
+            url (str): The URL.
+            article (dict, optional): The stored article. Its content_hash is recorded, so a later re-check can
+                                      tell whether the page changed since.
+        """
+        values = {"ingested": True}
+        if article is not None:
+            values["content_hash"] = content_hash(article)
+        with self.engine.begin() as connection:
+            connection.execute(update(CrawledUrl).where(CrawledUrl.url == url).values(**values))
+
+    def record(self, url, response, ingested=None):
+        """
+        Records a fetch of a URL.
+
+        Args:
+            url (str): The fetched URL.
+            response (requests.Response): The response; its ETag and Last-Modified are kept unless it is a 304.
+            ingested (bool, optional): Whether the article is now stored. None leaves the flag unchanged.
+        """
+        values = {"http_status": response.status_code, "fetched_at": datetime.utcnow()}
+        if response.status_code != 304:
+            values["etag"] = response.headers.get("ETag")
+            values["last_modified"] = response.headers.get("Last-Modified")
+        if ingested is not None:
+            values["ingested"] = ingested
+        with self.engine.begin() as connection:
+            updated = connection.execute(update(CrawledUrl).where(CrawledUrl.url == url).values(**values))
+            if not updated.rowcount:
+                connection.execute(insert(CrawledUrl).values(url=url, **values))
@@ -0,0 +1,106 @@
+"""
+Local stand-in for the X API's create tweet endpoint, for trying out the publishing queue without posting.
+
+Usage:
+    python -m utils.x_api_stub --port 8765 --limit 3 --window 60
+    X_API_BASE_URL=http://127.0.0.1:8765 streamlit run main.py
+"""
+
+import argparse
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class XApiStub(ThreadingHTTPServer):
+    """
+    Accepts POST /2/tweets and answers like X, including the rate limit headers and 429s once the limit is used up.
+    """
+
+    def __init__(self, address=("127.0.0.1", 0), limit=3, window=60):
+        """
+        Args:
+            address (tuple): Host and port to listen on. Port 0 picks a free port.
+            limit (int): Tweets accepted per window.
+            window (int): Length of the rate limit window in seconds.
+        """
+        super().__init__(address, _Handler)
+        self.limit = limit
+        self.window = window
+        self.tweets = []
+        self._ids = itertools.count(1)
+        self._window_start = time.time()
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def create_tweet(self, text):
+        """
+        Records a tweet if the rate limit allows it.
+
+        Returns:
+            tuple: (tweet_id or None if rate limited, remaining requests, reset time).
+        """
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.window:
+                self._window_start = now
+            reset = int(self._window_start + self.window)
+            used = sum(1 for _, posted_at in self.tweets if posted_at >= self._window_start)
+            if used >= self.limit:
+                return None, 0, reset
+            tweet_id = str(next(self._ids))
+            self.tweets.append((text, now))
+            return tweet_id, self.limit - used - 1, reset
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path != "/2/tweets":
+            self._reply(404, {"title": "Not Found"})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        tweet_id, remaining, reset = self.server.create_tweet(body.get("text", ""))
+        headers = {
+            "x-rate-limit-limit": self.server.limit,
+            "x-rate-limit-remaining": remaining,
+            "x-rate-limit-reset": reset,
+        }
+        if tweet_id is None:
+            self._reply(429, {"title": "Too Many Requests", "detail": "Too Many Requests"}, headers)
+        else:
+            self._reply(201, {"data": {"id": tweet_id, "text": body.get("text", "")}}, headers)
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        print(f"X API stub: {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub of the X API create tweet endpoint.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--limit", type=int, default=3, help="Tweets accepted per window.")
+    parser.add_argument("--window", type=int, default=60, help="Rate limit window in seconds.")
+    args = parser.parse_args()
+
+    server = XApiStub(("127.0.0.1", args.port), limit=args.limit, window=args.window)
+    print(f"X API stub listening on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
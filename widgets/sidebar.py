@@ -1,8 +1,7 @@
 import streamlit as st
 
 from utils.api_client import get_api_client
-
-from utils.api_client import get_api_client
+from utils.llm_cache import CachedClient, get_response_cache
 from widgets.select_model import select_model
 
 
@@ -19,7 +18,8 @@ class SidebarManager:
             if not client:
                 st.error("Failed to initialize API client. Check configuration and logs.")
                 st.stop()
-            return selected_model_name, client
+            # Chat completions are answered from the response cache when the request is deterministic or opts in
+            return selected_model_name, CachedClient(client, get_response_cache())
 
     def validate_api_key(self, api_config):
         api_key = api_config.get("key")